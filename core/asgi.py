@@ -12,10 +12,15 @@ django.setup()
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.security.websocket import AllowedHostsOriginValidator
 from interviews.routing import websocket_urlpatterns
+from interviews.lifespan import LifespanApp, install_reactor_shutdown_hook
 
 application = ProtocolTypeRouter({
     "http": get_asgi_application(),
     "websocket": AllowedHostsOriginValidator(
         URLRouter(websocket_urlpatterns)
     ),
-})
\ No newline at end of file
+    "lifespan": LifespanApp(),
+})
+
+# daphne (see Dockerfile) doesn't send lifespan events; clean up on reactor shutdown instead
+install_reactor_shutdown_hook()
\ No newline at end of file
@@ -66,7 +66,151 @@ GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 DEEPGRAM_API_KEY = os.getenv('DEEPGRAM_API_KEY')
 CENTRIFUGO_SECRET = os.getenv('CENTRIFUGO_TOKEN_HMAC_SECRET_KEY', 'talentcrew-secret-key-2026')
 CENTRIFUGO_API_KEY = os.getenv('CENTRIFUGO_API_KEY', 'talentcrew-api-key-2026')
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # bearer token for /api/metrics/ scrapers; unset -> staff login only
 CENTRIFUGO_HOST = 'http://centrifugo:8000' # Internal Docker network
+CENTRIFUGO_POOL_SIZE = int(os.getenv('CENTRIFUGO_POOL_SIZE', '100'))  # keep-alive connections per worker process
+CENTRIFUGO_KEEPALIVE = float(os.getenv('CENTRIFUGO_KEEPALIVE', '30'))  # seconds an idle connection is kept
+CENTRIFUGO_DNS_TTL = int(os.getenv('CENTRIFUGO_DNS_TTL', '300'))
+CENTRIFUGO_TIMEOUT = float(os.getenv('CENTRIFUGO_TIMEOUT', '5'))  # seconds per API request
+# Coalesce publishes issued within CENTRIFUGO_BATCH_WINDOW into one /api/batch request (ordered per channel)
+CENTRIFUGO_BATCHING = os.getenv('CENTRIFUGO_BATCHING', 'true').lower() == 'true'
+CENTRIFUGO_BATCH_WINDOW = float(os.getenv('CENTRIFUGO_BATCH_WINDOW', '0.005'))  # seconds
+CENTRIFUGO_BATCH_MAX = int(os.getenv('CENTRIFUGO_BATCH_MAX', '50'))  # publications per request
+CENTRIFUGO_BATCH_LANES = int(os.getenv('CENTRIFUGO_BATCH_LANES', '8'))  # batches in flight at once (per-channel order kept)
+
+# Per-session publish outbox: the interview loop enqueues and moves on, a background task delivers
+OUTBOX_MAX_EVENTS = int(os.getenv('OUTBOX_MAX_EVENTS', '500'))  # hard cap; oldest non-critical dropped first
+OUTBOX_SHED_DEPTH = int(os.getenv('OUTBOX_SHED_DEPTH', '200'))  # above this, non-critical events are shed
+OUTBOX_BATCH = int(os.getenv('OUTBOX_BATCH', '50'))  # publications handed to the batcher per round
+OUTBOX_MAX_RETRIES = int(os.getenv('OUTBOX_MAX_RETRIES', '5'))
+OUTBOX_RETRY_BASE = float(os.getenv('OUTBOX_RETRY_BASE', '0.2'))  # seconds, doubled per attempt (+ jitter)
+OUTBOX_RETRY_MAX = float(os.getenv('OUTBOX_RETRY_MAX', '5'))
+CENTRIFUGO_BREAKER_FAILURES = int(os.getenv('CENTRIFUGO_BREAKER_FAILURES', '5'))
+CENTRIFUGO_BREAKER_COOLDOWN = float(os.getenv('CENTRIFUGO_BREAKER_COOLDOWN', '10'))
+
+# Text-to-speech delivery
+# 'buffered' -> publish one tts_audio_complete message once the whole MP3 is synthesized
+# 'stream'   -> publish sequence-numbered tts_audio chunks as Deepgram renders them, then tts_audio_end
+#               (needs a frontend that handles tts_audio / tts_audio_end)
+TTS_DELIVERY_MODE = os.getenv('TTS_DELIVERY_MODE', 'buffered')
+TTS_STREAM_CHUNK_BYTES = int(os.getenv('TTS_STREAM_CHUNK_BYTES', '8192'))
+
+# Where TTS audio goes (negotiable per session with ?audio_transport=... or an audio_transport message)
+# 'centrifugo' -> base64 JSON publications on the interview channel
+# 'websocket'  -> raw binary frames on the interview websocket (12-byte header, see interviews/audio_frames.py);
+#                 Centrifugo then only carries text and control events
+AUDIO_TRANSPORT = os.getenv('AUDIO_TRANSPORT', 'centrifugo')
+AUDIO_TRANSPORTS_ALLOWED = os.getenv('AUDIO_TRANSPORTS_ALLOWED', 'centrifugo,websocket').split(',')
+
+# Sentence pipeline: split replies into sentences and synthesize up to N of them at once
+TTS_SENTENCE_PIPELINE = os.getenv('TTS_SENTENCE_PIPELINE', 'true').lower() == 'true'
+TTS_PIPELINE_CONCURRENCY = int(os.getenv('TTS_PIPELINE_CONCURRENCY', '3'))
+TTS_MIN_SENTENCE_CHARS = int(os.getenv('TTS_MIN_SENTENCE_CHARS', '20'))
+
+# Speech backend for live STT and TTS (interviews/speech_providers.py)
+# 'deepgram' -> Deepgram nova-2 live transcription + Aura TTS
+# 'fake'     -> deterministic in-process backend for offline load tests (no network, no API key)
+SPEECH_PROVIDER = os.getenv('SPEECH_PROVIDER', 'deepgram')
+FAKE_STT_TRANSCRIPTS = os.getenv('FAKE_STT_TRANSCRIPTS', (
+    "Um, I would start by profiling the slow endpoint and checking the query plan.|"
+    "We used Redis as a cache in front of Postgres and invalidated keys on write.|"
+    "I think, uh, the main trade-off is consistency versus latency under load."
+)).split('|')  # scripted answers, played in a loop
+FAKE_STT_WPM = int(os.getenv('FAKE_STT_WPM', '150'))
+FAKE_STT_SEGMENT_WORDS = int(os.getenv('FAKE_STT_SEGMENT_WORDS', '8'))  # words per final result
+FAKE_STT_ANSWER_GAP = float(os.getenv('FAKE_STT_ANSWER_GAP', '6'))  # seconds of audio before each answer
+FAKE_STT_BYTES_PER_SECOND = int(os.getenv('FAKE_STT_BYTES_PER_SECOND', '32000'))  # inbound audio clock (16 kHz linear16)
+FAKE_STT_LATENCY = float(os.getenv('FAKE_STT_LATENCY', '0.3'))  # audio -> result, seconds
+FAKE_STT_CONNECT_LATENCY = float(os.getenv('FAKE_STT_CONNECT_LATENCY', '0.4'))
+FAKE_TTS_FIRST_BYTE = float(os.getenv('FAKE_TTS_FIRST_BYTE', '0.25'))  # seconds
+FAKE_TTS_CHUNK_INTERVAL = float(os.getenv('FAKE_TTS_CHUNK_INTERVAL', '0.02'))  # seconds between chunks
+FAKE_TTS_BYTES_PER_CHAR = int(os.getenv('FAKE_TTS_BYTES_PER_CHAR', '400'))  # ~48 kbps MP3 at normal speaking pace
+FAKE_SPEECH_JITTER = float(os.getenv('FAKE_SPEECH_JITTER', '0.2'))  # +/- fraction, seeded (deterministic)
+
+# Stream the Gemini evaluation and start speaking as soon as next_question closes
+GEMINI_STREAMING = os.getenv('GEMINI_STREAMING', 'true').lower() == 'true'
+
+# Brain mode
+# 'single'   -> one call grades the answer and writes the next question
+# 'two_tier' -> fast live call (scores, pivot, next_question) + deferred grading call for PerAnswerMetric
+BRAIN_MODE = os.getenv('BRAIN_MODE', 'single')
+LIVE_MODEL_ID = os.getenv('LIVE_MODEL_ID', 'gemini-2.5-flash-lite')
+LIVE_TEMPERATURE = float(os.getenv('LIVE_TEMPERATURE', '0.7'))
+GRADING_MODEL_ID = os.getenv('GRADING_MODEL_ID', 'gemini-2.5-flash')
+GRADING_TEMPERATURE = float(os.getenv('GRADING_TEMPERATURE', '0.2'))
+BRAIN_HISTORY_SIZE = int(os.getenv('BRAIN_HISTORY_SIZE', '3'))  # answer digests kept in the prompt state
+PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '2000'))  # estimated tokens per evaluation prompt
+
+# Pre-generated intros / opening questions (+ audio) per JobPosting
+OPENER_BANK_INTROS = int(os.getenv('OPENER_BANK_INTROS', '3'))
+OPENER_BANK_QUESTIONS = int(os.getenv('OPENER_BANK_QUESTIONS', '5'))
+OPENER_MODEL_ID = os.getenv('OPENER_MODEL_ID', 'gemini-2.5-flash')
+
+# Lobby pre-warming: /connect/ starts building the brain + intro audio ahead of the websocket
+PREWARM_ENABLED = os.getenv('PREWARM_ENABLED', 'true').lower() == 'true'
+PREWARM_TTL = float(os.getenv('PREWARM_TTL', '300'))  # seconds a warmed session is kept
+PREWARM_CLAIM_WAIT = float(os.getenv('PREWARM_CLAIM_WAIT', '10'))  # max wait for an in-progress warm-up
+
+# Batched grading worker (two_tier mode): one Gemini call grades up to N answers across sessions
+GRADING_BATCHED = os.getenv('GRADING_BATCHED', 'false').lower() == 'true'
+GRADING_BATCH_SIZE = int(os.getenv('GRADING_BATCH_SIZE', '8'))
+GRADING_BATCH_WINDOW = float(os.getenv('GRADING_BATCH_WINDOW', '5'))  # seconds
+GRADING_MAX_CONCURRENCY = int(os.getenv('GRADING_MAX_CONCURRENCY', '2'))
+GRADING_MAX_RETRIES = int(os.getenv('GRADING_MAX_RETRIES', '3'))
+
+# Gemini request limits (all LLM calls go through interviews/llm.py on client.aio)
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '32'))  # per worker process
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '20'))  # seconds
+LLM_STREAM_TIMEOUT = float(os.getenv('LLM_STREAM_TIMEOUT', '45'))
+LLM_BATCH_TIMEOUT = float(os.getenv('LLM_BATCH_TIMEOUT', '120'))
+
+# Live-turn latency budget: hedge to a secondary model after LLM_HEDGE_DELAY, give up after LLM_TURN_BUDGET
+LLM_TURN_BUDGET = float(os.getenv('LLM_TURN_BUDGET', '12'))  # seconds
+LLM_HEDGE_DELAY = float(os.getenv('LLM_HEDGE_DELAY', '3'))
+LLM_HEDGE_MODEL_ID = os.getenv('LLM_HEDGE_MODEL_ID', 'gemini-2.0-flash')  # empty disables hedging
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '1'))
+LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', '0.3'))
+LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', '5'))
+LLM_BREAKER_COOLDOWN = float(os.getenv('LLM_BREAKER_COOLDOWN', '30'))
+
+# Candidate audio relay to Deepgram: one sender per connection coalescing inbound frames
+# 'block'       -> backpressure: receive() waits for queue space (safe for containerized webm/opus)
+# 'drop_oldest' -> shed the oldest queued frame when Deepgram falls behind (raw PCM only)
+AUDIO_RELAY_QUEUE_FRAMES = int(os.getenv('AUDIO_RELAY_QUEUE_FRAMES', '100'))
+AUDIO_RELAY_PACKET_BYTES = int(os.getenv('AUDIO_RELAY_PACKET_BYTES', '8192'))
+AUDIO_RELAY_MAX_DELAY = float(os.getenv('AUDIO_RELAY_MAX_DELAY', '0.08'))  # seconds a frame may wait for company
+AUDIO_RELAY_DROP_POLICY = os.getenv('AUDIO_RELAY_DROP_POLICY', 'block')
+
+# Deepgram keepalives: one scheduler per worker pings live connections that have sent no audio for KEEPALIVE_IDLE
+KEEPALIVE_IDLE = float(os.getenv('KEEPALIVE_IDLE', '4'))  # seconds (Deepgram closes idle streams after ~10s)
+KEEPALIVE_TICK = float(os.getenv('KEEPALIVE_TICK', '1'))
+
+# Turn taking
+# 'server' -> end the candidate's turn from Deepgram endpointing (speech_final / UtteranceEnd); the
+#             client's user_finished_speaking still works as a manual override
+# 'manual' -> only user_finished_speaking ends a turn
+TURN_DETECTION = os.getenv('TURN_DETECTION', 'server')
+TURN_ENDPOINTING_MS = int(os.getenv('TURN_ENDPOINTING_MS', '100'))  # Deepgram silence before speech_final
+TURN_UTTERANCE_END_MS = int(os.getenv('TURN_UTTERANCE_END_MS', '1500'))  # Deepgram word gap before UtteranceEnd (>= 1000)
+TURN_SILENCE_GRACE = float(os.getenv('TURN_SILENCE_GRACE', '0.9'))  # extra silence after speech_final, seconds
+TURN_MIN_WORDS = int(os.getenv('TURN_MIN_WORDS', '3'))  # speech_final on shorter answers waits for UtteranceEnd or the manual signal
+
+# Speculative evaluation: start the LLM call once the final transcript has been stable for
+# SPECULATION_STABLE_MS; thrown away (and paid for) if the candidate keeps talking
+SPECULATIVE_EVALUATION = os.getenv('SPECULATIVE_EVALUATION', 'false').lower() == 'true'
+SPECULATION_STABLE_MS = int(os.getenv('SPECULATION_STABLE_MS', '300'))
+
+# Barge-in: candidate speech (BARGE_IN_MIN_WORDS interim words) cancels the interviewer's turn in flight.
+# Mid-playback it stops TTS; before playback it folds the answer back in and waits for the rest.
+# Relies on browser echo cancellation so the interviewer's own voice doesn't trigger it.
+BARGE_IN_ENABLED = os.getenv('BARGE_IN_ENABLED', 'true').lower() == 'true'
+BARGE_IN_MIN_WORDS = int(os.getenv('BARGE_IN_MIN_WORDS', '2'))
+
+# Local speech-behaviour features (interviews/speech_features.py) used for the cheating flags
+SPEECH_HISTORY_SIZE = int(os.getenv('SPEECH_HISTORY_SIZE', '10'))  # earlier answers compared for fluency_shift
+SPEECH_LATENCY_FLAG = float(os.getenv('SPEECH_LATENCY_FLAG', '8'))  # seconds before a suspiciously fluent answer
+SPEECH_FLUENCY_SPIKE = float(os.getenv('SPEECH_FLUENCY_SPIKE', '2'))  # speaking-rate z-score vs earlier answers
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, JobPosting, InterviewSession, EvidenceSnippet, PerAnswerMetric
+from .models import User, JobPosting, InterviewSession, EvidenceSnippet, PerAnswerMetric, InterviewOpener
 
 
 @admin.register(User)
@@ -55,3 +55,12 @@ class PerAnswerMetricAdmin(admin.ModelAdmin):
     list_filter = ['is_cheating_suspected', 'bias_flag']
     search_fields = ['session__candidate_name', 'question_asked']
     readonly_fields = ['timestamp']
+
+
+@admin.register(InterviewOpener)
+class InterviewOpenerAdmin(admin.ModelAdmin):
+    list_display = ['job', 'kind', 'text', 'created_at']
+    list_filter = ['kind']
+    search_fields = ['job__title', 'text']
+    readonly_fields = ['created_at']
+    exclude = ['audio']
@@ -0,0 +1,48 @@
+"""
+Binary Audio Framing
+Header format for TTS audio sent as raw binary websocket frames (instead of
+base64 JSON through Centrifugo). Every frame is a 12-byte big-endian header
+followed by the audio payload:
+
+    version:u8 | kind:u8 | format:u8 | reserved:u8 | utterance:u32 | sequence:u32
+
+kind 1 = audio chunk, kind 2 = end of utterance (sequence = total chunks, no payload).
+`utterance` increases with every interviewer reply so the client can drop
+frames that belong to a reply it already stopped (barge-in).
+"""
+
+
+import struct
+from typing import NamedTuple
+
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct(">BBBxII")
+
+KIND_AUDIO = 1
+KIND_END = 2
+
+FORMAT_CODES = {"mp3": 1, "pcm16": 2}
+FORMAT_NAMES = {code: name for name, code in FORMAT_CODES.items()}
+
+
+class AudioFrame(NamedTuple):
+    kind: int
+    audio_format: str
+    utterance: int
+    sequence: int
+    payload: bytes
+
+
+def encode_frame(kind: int, audio_format: str, utterance: int, sequence: int, payload: bytes = b"") -> bytes:
+    header = FRAME_HEADER.pack(
+        FRAME_VERSION, kind, FORMAT_CODES[audio_format], utterance & 0xFFFFFFFF, sequence & 0xFFFFFFFF
+    )
+    return header + payload
+
+
+def decode_frame(frame: bytes) -> AudioFrame:
+    version, kind, format_code, utterance, sequence = FRAME_HEADER.unpack_from(frame)
+    if version != FRAME_VERSION:
+        raise ValueError(f"Unsupported audio frame version: {version}")
+    return AudioFrame(kind, FORMAT_NAMES.get(format_code, "unknown"), utterance, sequence,
+                      bytes(frame[FRAME_HEADER.size:]))
@@ -0,0 +1,143 @@
+"""
+Candidate Audio Relay
+Queues inbound websocket audio frames per connection and forwards them to the
+Deepgram live connection from a single sender task, coalescing small frames
+into larger packets so we pay one executor hop per packet instead of per frame.
+"""
+
+
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DROP_POLICIES = ("block", "drop_oldest")
+
+
+class AudioRelay:
+    """
+    Ordered, bounded frame relay with one writer.
+
+    `send` is the blocking send of the live STT handle; it only ever runs on
+    one worker thread at a time, so packets reach the provider in order.
+    """
+
+    def __init__(self, send: Callable[[bytes], object], max_frames: int = 100, packet_bytes: int = 8192,
+                 max_delay: float = 0.08, drop_policy: str = "block"):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown audio relay drop policy: {drop_policy}")
+        self.send = send
+        self.packet_bytes = packet_bytes
+        self.max_delay = max_delay
+        self.drop_policy = drop_policy
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_frames))
+        self.task = None
+        self.closed = False
+
+        self.frames_in = 0
+        self.packets_out = 0
+        self.dropped_frames = 0
+        self.dropped_bytes = 0
+        self.last_sent_at = 0.0
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+        return self
+
+    async def push(self, frame: bytes):
+        if self.closed or not frame:
+            return
+        self.frames_in += 1
+        if self.queue.full() and self.drop_policy == "drop_oldest":
+            self._drop(self.queue.get_nowait())
+        await self.queue.put(frame)
+        metrics.add_gauge("audio_relay_queue_frames", 1)
+
+    async def close(self, flush: bool = True, timeout: float = 2.0):
+        """Stop accepting frames; optionally send what is still queued."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.task is None:
+            return
+        if not flush:
+            self.task.cancel()
+        else:
+            # The sentinel may have to wait for space under the block policy
+            try:
+                async with asyncio.timeout(timeout):
+                    await self.queue.put(None)
+                    await self.task
+            except TimeoutError:
+                self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+        pending = self.queue.qsize()
+        while not self.queue.empty():
+            frame = self.queue.get_nowait()
+            if frame is not None:
+                self._drop(frame)
+        logger.info(
+            f"🎙️ Audio relay closed: {self.frames_in} frames → {self.packets_out} packets, "
+            f"dropped {self.dropped_frames} frames / {self.dropped_bytes} bytes"
+            + (f", {pending} left in queue" if pending else "")
+        )
+
+    def _drop(self, frame: bytes):
+        metrics.add_gauge("audio_relay_queue_frames", -1)
+        self.dropped_frames += 1
+        self.dropped_bytes += len(frame)
+        metrics.incr("audio_relay_dropped_frames_total")
+        metrics.incr("audio_relay_dropped_bytes_total", len(frame))
+
+    async def _next_packet(self):
+        """Wait for one frame, then gather more until packet_bytes or max_delay. None means stop."""
+        frame = await self.queue.get()
+        if frame is None:
+            return None, True
+        metrics.add_gauge("audio_relay_queue_frames", -1)
+
+        loop = asyncio.get_running_loop()
+        packet, size = [frame], len(frame)
+        deadline = loop.time() + self.max_delay
+        while size < self.packet_bytes:
+            try:
+                frame = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    async with asyncio.timeout(remaining):
+                        frame = await self.queue.get()
+                except TimeoutError:
+                    break
+            if frame is None:
+                return b"".join(packet), True
+            metrics.add_gauge("audio_relay_queue_frames", -1)
+            packet.append(frame)
+            size += len(frame)
+        return b"".join(packet), False
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            packet, stopping = await self._next_packet()
+            if not packet:
+                continue
+            try:
+                await asyncio.to_thread(self.send, packet)
+                self.packets_out += 1
+                self.last_sent_at = time.monotonic()
+                metrics.incr("audio_relay_packets_total")
+                metrics.incr("audio_relay_bytes_total", len(packet))
+            except Exception as e:
+                logger.error(f"❌ Deepgram Relay Error: {e}")
@@ -5,13 +5,81 @@ Handles real-time audio chunk publishing to React frontend
 
 
 import aiohttp
+import asyncio
 import base64
+import json
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from django.conf import settings
 
+from .metrics import metrics
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json works the same, just slower
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def json_dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def json_loads(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def interview_channel(session_id: str) -> str:
+    return f"interviews:interview:{session_id}"
+
+
+def audio_chunk_payload(audio_chunk: bytes, sequence: Optional[int] = None, audio_format: str = "pcm16") -> Dict[str, Any]:
+    payload = {
+        "audio": base64.b64encode(audio_chunk).decode('utf-8'),
+        "type": "tts_audio",
+        "format": audio_format
+    }
+    
+    if audio_format == "pcm16":
+        payload["sample_rate"] = 16000
+        payload["channels"] = 1
+    
+    if sequence is not None:
+        payload["sequence"] = sequence
+    return payload
+
+
+def audio_end_payload(total_chunks: int, audio_format: str = "pcm16") -> Dict[str, Any]:
+    return {
+        "type": "tts_audio_end",
+        "total_chunks": total_chunks,
+        "format": audio_format
+    }
+
+
+def text_message_payload(message: str, message_type: str = "interviewer") -> Dict[str, Any]:
+    return {
+        "type": "text_message",
+        "message": message,
+        "sender": message_type
+    }
+
+
+def event_payload(event_type: str, event_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {
+        "type": "event",
+        "event": event_type,
+        "data": event_data or {}
+    }
+
 
 class CentrifugoPublisher:
     """
@@ -24,16 +92,28 @@ class CentrifugoPublisher:
         self.api_url = f"{settings.CENTRIFUGO_HOST}/api"
         self.api_key = settings.CENTRIFUGO_API_KEY
         self.session: Optional[aiohttp.ClientSession] = None
+        self.in_flight = 0
+        self.batcher: Optional[PublishBatcher] = None
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
+        """Get or create the pooled aiohttp session (keep-alive connections reused across interviews)."""
         if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.CENTRIFUGO_POOL_SIZE,
+                limit_per_host=settings.CENTRIFUGO_POOL_SIZE,
+                keepalive_timeout=settings.CENTRIFUGO_KEEPALIVE,
+                ttl_dns_cache=settings.CENTRIFUGO_DNS_TTL,
+            )
             self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=settings.CENTRIFUGO_TIMEOUT),
                 headers={
                     "Content-Type": "application/json",
                     "Authorization": f"apikey {self.api_key}"
                 }
             )
+            metrics.set_gauge("centrifugo_pool_limit", settings.CENTRIFUGO_POOL_SIZE)
+            logger.info(f"🔌 Centrifugo connection pool opened (limit {settings.CENTRIFUGO_POOL_SIZE})")
         return self.session
     
     async def publish(
@@ -53,134 +133,72 @@ class CentrifugoPublisher:
         Returns:
             API response dict
         """
+        # Handle binary data (audio chunks)
+        if is_binary and isinstance(data, bytes):
+            # Base64 encode for JSON transport
+            data = {
+                "audio": base64.b64encode(data).decode('utf-8'),
+                "type": "audio_chunk"
+            }
+
+        if settings.CENTRIFUGO_BATCHING:
+            return await self._get_batcher().submit(channel, data)
+
+        return await self._post(self.api_url, {
+            "method": "publish",
+            "params": {
+                "channel": channel,
+                "data": data
+            }
+        }, method="publish")
+
+    async def _post(self, url: str, payload: Dict[str, Any], method: str) -> Dict[str, Any]:
+        """POST one API request; returns the decoded reply or {"error": ...}."""
         try:
             session = await self._get_session()
             
-            # Prepare payload
-            payload = {
-                "method": "publish",
-                "params": {
-                    "channel": channel
-                }
-            }
-            
-            # Handle binary data (audio chunks)
-            if is_binary and isinstance(data, bytes):
-                # Base64 encode for JSON transport
-                payload["params"]["data"] = {
-                    "audio": base64.b64encode(data).decode('utf-8'),
-                    "type": "audio_chunk"
-                }
-            else:
-                payload["params"]["data"] = data
-            
             # Send HTTP POST to Centrifugo API
-            async with session.post(self.api_url, json=payload) as response:
-                result = await response.json()
-                
-                if response.status != 200:
-                    logger.error(f"Centrifugo publish failed: {result}")
-                    return {"error": result}
+            self.in_flight += 1
+            metrics.set_gauge("centrifugo_requests_in_flight", self.in_flight)
+            started = time.monotonic()
+            try:
+                async with session.post(url, data=json_dumps(payload)) as response:
+                    result = json_loads(await response.read())
+            finally:
+                self.in_flight -= 1
+                metrics.set_gauge("centrifugo_requests_in_flight", self.in_flight)
+                metrics.observe("centrifugo_publish_seconds", time.monotonic() - started, method=method)
+                self._record_pool()
                 
-                return result
+            if response.status != 200 or "error" in result:
+                logger.error(f"Centrifugo {method} failed: {result}")
+                metrics.incr("centrifugo_publish_errors_total", method=method)
+                return {"error": result.get("error", result)}
+            
+            return result
                 
         except Exception as e:
             logger.error(f"Failed to publish to Centrifugo: {e}")
+            metrics.incr("centrifugo_publish_errors_total", method=method)
             return {"error": str(e)}
-    
-    async def publish_audio_chunk(
-        self, 
-        session_id: str, 
-        audio_chunk: bytes,
-        sequence: Optional[int] = None
-    ) -> bool:
-        """
-        Publish audio chunk to interview channel.
-        
-        Args:
-            session_id: Interview session UUID
-            audio_chunk: PCM 16-bit audio bytes
-            sequence: Optional sequence number for ordering
-        
-        Returns:
-            True if successful, False otherwise
-        """
-        channel = f"interviews:interview:{session_id}"
-        
-        payload = {
-            "audio": base64.b64encode(audio_chunk).decode('utf-8'),
-            "type": "tts_audio",
-            "format": "pcm16",
-            "sample_rate": 16000,
-            "channels": 1
-        }
-        
-        if sequence is not None:
-            payload["sequence"] = sequence
-        
-        result = await self.publish(channel, payload, is_binary=False)
-        
-        success = "error" not in result
-        if not success:
-            logger.warning(f"Audio chunk publish failed: {result.get('error')}")
-        
-        return success
-    
-    async def publish_text_message(
-        self, 
-        session_id: str, 
-        message: str,
-        message_type: str = "interviewer"
-    ) -> bool:
-        """
-        Publish text message to interview channel.
-        
-        Args:
-            session_id: Interview session UUID
-            message: Text message
-            message_type: Type of message (interviewer, system, etc.)
-        
-        Returns:
-            True if successful
-        """
-        channel = f"interviews:interview:{session_id}"
-        
-        payload = {
-            "type": "text_message",
-            "message": message,
-            "sender": message_type
-        }
-        
-        result = await self.publish(channel, payload)
-        return "error" not in result
-    
-    async def publish_event(
-        self,
-        session_id: str,
-        event_type: str,
-        event_data: Optional[Dict[str, Any]] = None
-    ) -> bool:
-        """
-        Publish system event to interview channel.
-        
-        Args:
-            session_id: Interview session UUID
-            event_type: Event type (e.g., "speech_start", "speech_end")
-            event_data: Optional event metadata
-        
-        Returns:
-            True if successful
-        """
-        channel = f"interviews:interview:{session_id}"
-        
-        payload = {
-            "type": "event",
-            "event": event_type,
-            "data": event_data or {}
-        }
-        
-        result = await self.publish(channel, payload)
-        return "error" not in result
+
+    def _get_batcher(self) -> "PublishBatcher":
+        if self.batcher is None:
+            self.batcher = PublishBatcher(
+                self,
+                window=settings.CENTRIFUGO_BATCH_WINDOW,
+                max_size=settings.CENTRIFUGO_BATCH_MAX,
+                lanes=settings.CENTRIFUGO_BATCH_LANES,
+            )
+        return self.batcher
+
+    def _record_pool(self):
+        """Pool usage gauges: connections checked out vs. idle keep-alive connections."""
+        connector = self.session.connector if self.session else None
+        if connector is None:
+            return
+        metrics.set_gauge("centrifugo_pool_acquired", len(getattr(connector, "_acquired", ())))
+        metrics.set_gauge("centrifugo_pool_idle", sum(len(c) for c in getattr(connector, "_conns", {}).values()))
     
     async def close(self):
         """Close aiohttp session."""
@@ -189,7 +207,72 @@ class CentrifugoPublisher:
             logger.info("🔌 Centrifugo publisher session closed")
 
 
-# Convenience function for getting publisher instance
+class PublishBatcher:
+    """
+    Coalesces publishes issued within `window` seconds into one /api/batch call.
+
+    Channels hash onto a fixed set of lanes. Each lane has at most one batch in
+    flight and Centrifugo applies a batch's commands in order, so publications
+    on one channel keep their order while unrelated channels flush in parallel.
+    """
+
+    def __init__(self, publisher: CentrifugoPublisher, window: float = 0.005, max_size: int = 50, lanes: int = 8):
+        self.publisher = publisher
+        self.batch_url = f"{settings.CENTRIFUGO_HOST}/api/batch"
+        self.window = window
+        self.max_size = max(1, max_size)
+        self.pending: List[List[Tuple[str, Any, asyncio.Future]]] = [[] for _ in range(max(1, lanes))]
+        self.workers: List[Optional[asyncio.Task]] = [None] * len(self.pending)
+
+    async def submit(self, channel: str, data: Any) -> Dict[str, Any]:
+        lane = hash(channel) % len(self.pending)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[lane].append((channel, data, future))
+        worker = self.workers[lane]
+        if worker is None or worker.done():
+            self.workers[lane] = asyncio.create_task(self._drain(lane))
+        return await future
+
+    async def _drain(self, lane: int):
+        pending = self.pending[lane]
+        while pending:
+            if len(pending) < self.max_size:
+                await asyncio.sleep(self.window)
+            batch = pending[:self.max_size]
+            del pending[:self.max_size]
+            await self._send(batch)
+
+    async def _send(self, batch):
+        metrics.observe("centrifugo_batch_size", len(batch), buckets=BATCH_SIZE_BUCKETS)
+        result = await self.publisher._post(self.batch_url, {
+            "commands": [{"publish": {"channel": channel, "data": data}} for channel, data, _ in batch]
+        }, method="batch")
+
+        replies = result.get("replies") if "error" not in result else None
+        for index, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if replies is None:
+                future.set_result({"error": result["error"]})
+            else:
+                reply = replies[index] if index < len(replies) else {}
+                future.set_result({"error": reply["error"]} if "error" in reply else reply.get("publish", {}))
+
+
+_publisher: Optional[CentrifugoPublisher] = None
+
+
 def get_centrifugo_publisher() -> CentrifugoPublisher:
-    """Get a new Centrifugo publisher instance."""
-    return CentrifugoPublisher()
+    """Get the Centrifugo publisher shared by every interview in this process (don't close it)."""
+    global _publisher
+    if _publisher is None:
+        _publisher = CentrifugoPublisher()
+    return _publisher
+
+
+async def shutdown_centrifugo_publisher():
+    """Close the shared connection pool (ASGI lifespan shutdown)."""
+    global _publisher
+    if _publisher is not None:
+        await _publisher.close()
+        _publisher = None
@@ -2,12 +2,27 @@ import logging
 import asyncio
 import json
 import time 
+from contextlib import aclosing
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
-from deepgram import DeepgramClient, DeepgramClientOptions, LiveTranscriptionEvents, LiveOptions
-from deepgram.clients.speak.v1 import SpeakOptions
 from django.conf import settings
 from .services import InterviewerBrain
+from .models import InterviewSession
+from .metrics import metrics
+from . import llm
 from .centrifugo_client import get_centrifugo_publisher
+from .outbox import PublishOutbox
+from .tts import SentenceTTSPipeline
+from .speech_providers import get_speech_provider
+from .prewarm import claim_prewarmed
+from .audio_relay import AudioRelay
+from .keepalive import get_keepalive_scheduler
+from .turn_detection import TurnDetector
+from .speculation import Speculator
+from .turns import TurnScheduler, THINKING
+from .transcript import Transcript, TranscriptSegment
+from .audio_frames import encode_frame, KIND_AUDIO, KIND_END
+from .utils import spawn_background
 
 logger = logging.getLogger(__name__)
 
@@ -15,150 +30,367 @@ class UnifiedInterviewConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.session_id = self.scope['url_route']['kwargs']['session_id']
         self.loop = asyncio.get_running_loop()
-        self.brain = await asyncio.to_thread(InterviewerBrain, self.session_id)
-        self.centrifugo = get_centrifugo_publisher()
+        self.outbox = PublishOutbox(get_centrifugo_publisher(), self.session_id)
+        self.speech = get_speech_provider()
         
-        config = DeepgramClientOptions(options={"keepalive": "true"})
-        self.dg_client = DeepgramClient(settings.DEEPGRAM_API_KEY, config)
-        self.dg_connection = self.dg_client.listen.live.v("1")
-
-        self.transcript_buffer = ""
+        self.transcript = Transcript()
         
         self.ai_finished_speaking_time = 0
         self.user_first_word_time = 0
 
-        def on_transcript(self_dg, result, **kwargs):
-            sentence = result.channel.alternatives[0].transcript
-            if len(sentence) == 0 or not result.is_final:
-                return
-            
-            if self.user_first_word_time == 0:
-                self.user_first_word_time = time.time()
-                
-            self.transcript_buffer += sentence + " "
-            logger.info(f"📝 Captured so far: {sentence}")
+        self.warm_intro = None
+        self.intro_task = None
+        self.audio_relay = None
+        self.turn_detector = None
+        self.speculator = None
+        self.turns = TurnScheduler(self.session_id)
+        if settings.TURN_DETECTION == "server":
+            self.turn_detector = TurnDetector(
+                self._end_turn,
+                silence_grace=settings.TURN_SILENCE_GRACE,
+                min_words=settings.TURN_MIN_WORDS,
+            )
+        self.stage_timings = {}
 
-        self.dg_connection.on(LiveTranscriptionEvents.Transcript, on_transcript)
-        
-        options = LiveOptions(
-            model="nova-2", 
-            language="en-US", 
-            interim_results=True,
-            smart_format=True,
-            endpointing="100" 
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        self.audio_transport = self._choose_audio_transport(query.get('audio_transport', [None])[0])
+        self.utterance_id = 0
+        self.utterance_transport = self.audio_transport
+        self.connect_started = time.monotonic()
+
+        # 🚀 Setup stages run concurrently: [DB load ‖ LLM client] → brain → intro, alongside the STT start.
+        # The websocket is accepted once the brain and live transcription are ready; the intro keeps going.
+        failed = False
+        try:
+            async with asyncio.TaskGroup() as stages:
+                stages.create_task(self._timed("brain", self._load_brain()))
+                stages.create_task(self._timed("stt", self._start_transcription()))
+        except* Exception as group:
+            for e in group.exceptions:
+                logger.error(f"❌ Connection Setup Failed: {e}")
+            failed = True
+
+        if failed:
+            if self.intro_task:
+                self.intro_task.cancel()
+            await self.close()
+            return
+
+        await self.accept()
+        logger.info(f"✅ Speech Pipeline Active ({self.speech.name}): {self.session_id} | Stages: {self.stage_timings}")
+        await self._ack_audio_transport()
+
+        # 💓 Pinged by the shared scheduler only while no candidate audio is flowing
+        get_keepalive_scheduler().register(
+            self.channel_name, self.stt.send, lambda: self.audio_relay.last_sent_at
         )
-        
+        self.turns.submit(self.start_interview_flow)
+
+    async def _timed(self, stage, coro):
+        started = time.monotonic()
         try:
-            started = await asyncio.to_thread(self.dg_connection.start, options)
-            if not started: raise Exception("Deepgram rejected connection")
-            await self.accept()
-            logger.info(f"✅ Deepgram Pipeline Active: {self.session_id}")
-            
-            async def keep_alive_pinger():
-                while True:
-                    await asyncio.sleep(3) 
-                    try:
-                        if hasattr(self, 'dg_connection'):
-                            await asyncio.to_thread(
-                                self.dg_connection.send, 
-                                json.dumps({"type": "KeepAlive"})
-                            )
-                    except Exception:
-                        break 
-
-            asyncio.run_coroutine_threadsafe(keep_alive_pinger(), self.loop)
-            asyncio.run_coroutine_threadsafe(self.start_interview_flow(), self.loop)
+            return await coro
+        finally:
+            elapsed = time.monotonic() - started
+            self.stage_timings[stage] = round(elapsed, 3)
+            metrics.observe("connect_stage_seconds", elapsed, stage=stage)
+
+    async def _load_brain(self):
+        # 🔥 Pick up the brain + rendered intro built during the lobby, if any
+        warm = await self._timed("prewarm_claim", claim_prewarmed(self.session_id))
+        if warm:
+            self.brain, self.warm_intro = warm
+            logger.info(f"🔥 Using pre-warmed pipeline: {self.session_id}")
+        else:
+            async with asyncio.TaskGroup() as tg:
+                session = tg.create_task(self._timed("db_load", asyncio.to_thread(
+                    InterviewSession.objects.select_related('job').get, id=self.session_id
+                )))
+                client = tg.create_task(self._timed("llm_client", asyncio.to_thread(llm.create_client)))
+            self.brain = await self._timed("brain_init", asyncio.to_thread(
+                InterviewerBrain, self.session_id, client=client.result(), session=session.result()
+            ))
+
+        if settings.SPECULATIVE_EVALUATION:
+            self.speculator = Speculator(self.brain, stable_after=settings.SPECULATION_STABLE_MS / 1000)
+
+        # Intro generation overlaps with the rest of setup; start_interview_flow awaits it
+        self.intro_task = asyncio.create_task(self._timed("intro", self._prepare_intro()))
+
+    async def _prepare_intro(self):
+        if self.warm_intro:
+            return self.warm_intro
+        return await self.brain.get_intro_segments()
+
+    async def _start_transcription(self):
+        # Provider callbacks may run on another thread; hand everything to the event loop
+        def on_transcript(result):
+            self.loop.call_soon_threadsafe(self._handle_transcript, result, time.time())
+
+        def on_utterance_end():
+            if self.turn_detector:
+                self.loop.call_soon_threadsafe(self.turn_detector.on_utterance_end)
+
+        self.stt = await self.speech.start_live(
+            on_transcript,
+            on_utterance_end,
+            endpointing_ms=settings.TURN_ENDPOINTING_MS,
+            utterance_end_ms=settings.TURN_UTTERANCE_END_MS,
+        )
+
+        self.audio_relay = AudioRelay(
+            self.stt.send,
+            max_frames=settings.AUDIO_RELAY_QUEUE_FRAMES,
+            packet_bytes=settings.AUDIO_RELAY_PACKET_BYTES,
+            max_delay=settings.AUDIO_RELAY_MAX_DELAY,
+            drop_policy=settings.AUDIO_RELAY_DROP_POLICY,
+        ).start()
+
+    def _handle_transcript(self, result, received_at):
+        sentence = result.channel.alternatives[0].transcript
+        if not result.is_final:
+            if self.turn_detector:
+                self.turn_detector.on_interim(sentence)
+            if self.speculator and sentence.strip():
+                self.speculator.on_speech()
+            if settings.BARGE_IN_ENABLED and len(sentence.split()) >= max(1, settings.BARGE_IN_MIN_WORDS):
+                self._barge_in()
+            return
+        if len(sentence) == 0:
+            return
+
+        segment = TranscriptSegment.from_result(result)
+        if self.user_first_word_time == 0:
+            # When the first word was actually spoken, not when its final transcript arrived.
+            # Only the offset within this result comes from the audio clock: that clock stops
+            # whenever client audio does (muted mic, stalls, dropped frames), so it can't be
+            # mapped onto wall time as a whole.
+            self.user_first_word_time = received_at - max(0.0, segment.end - segment.first_word_start)
+
+        self.transcript.append(segment)
+        logger.info(f"📝 Captured so far: {sentence}")
+
+        if self.speculator:
+            self.speculator.on_final(self.transcript, self._pause_duration())
+        if self.turn_detector:
+            self.turn_detector.on_final(sentence, bool(getattr(result, "speech_final", False)))
+
+    def _barge_in(self):
+        """The candidate is talking over an interviewer turn: cancel it."""
+        if not self.turns.interruptible():
+            return
+        phase, unspoken = self.turns.interrupt()
+        logger.info(f"✋ Barge-in while {phase}")
+
+        # Replies that were never heard: the candidate is still answering, fold those answers back in
+        for answer in reversed(unspoken):
+            self.transcript.prepend(answer)
+            if self.turn_detector:
+                self.turn_detector.restore(answer.text)
+        if phase != THINKING:
+            if self.utterance_transport != "websocket":
+                self.outbox.drop_utterance(self.utterance_id)
+            self.outbox.event("speech_interrupted", {"utterance": self.utterance_id})
+            self.ai_finished_speaking_time = time.time()
+            self.user_first_word_time = 0
+
+    def _pause_duration(self):
+        if self.ai_finished_speaking_time > 0 and self.user_first_word_time > 0:
+            return round(max(0.0, self.user_first_word_time - self.ai_finished_speaking_time), 2)
+        return 0
+
+    def _end_turn(self, reason):
+        """Close the candidate's turn and start the reply. Returns False if nothing was said."""
+        if self.turn_detector:
+            self.turn_detector.reset()
+
+        if not self.transcript:
+            return False
+
+        answer = self.transcript.take()
+        final_text = answer.text
+        pause_duration = self._pause_duration()
+        speculation = self.speculator.take(final_text) if self.speculator else None
+        speech = self.brain.speech_features(answer, pause_duration)
             
-        except Exception as e:
-            logger.error(f"❌ Deepgram Connection Failed: {e}")
-            await self.close()
+        logger.info(f"🎤 TURN ENDED ({reason}). GAP: {pause_duration}s | TEXT: {final_text}")
+        if speech is not None:
+            logger.info(f"🗣️ Speech: {speech.render()}")
+        
+        self.turns.submit(self.generate_response, answer, pause_duration, speculation, speech, answer=answer)
+        return True
 
     async def start_interview_flow(self):
         try:
-            intro_text = await self.brain.generate_intro()
-            await self.speak_text(intro_text)
+            segments = await self.intro_task
+            self.warm_intro = None
+            self.turns.speaking()
+            # The interview has really started only now (pre-warming leaves the session untouched)
+            spawn_background(self.brain.mark_started())
+            await self.speak_text(" ".join(text for text, _ in segments), segments)
         except Exception as e:
             logger.error(f"❌ Intro Error: {e}")
 
-    async def generate_response(self, text, pause_duration):
+    async def generate_response(self, answer, pause_duration, speculation=None, speech=None):
         try:
-            ai_text = await self.brain.get_answer(text, pause_duration)
+            ai_text = await self.brain.get_answer(
+                answer.text, pause_duration, speculation=speculation, segments=answer.to_list(), speech=speech
+            )
+            self.turns.speaking()
             
             if ai_text.startswith("FINISH_INTERVIEW:"):
                 clean_text = ai_text.replace("FINISH_INTERVIEW:", "").strip()
-                await self.speak_text(clean_text)
-                
-                logger.info("🏁 Sending interview_complete event to frontend")
-                await self.centrifugo.publish(
-                    f"interviews:interview:{self.session_id}",
-                    {"type": "interview_complete"}
-                )
+                try:
+                    await self.speak_text(clean_text)
+                finally:
+                    # Sent even if the closing line is talked over
+                    logger.info("🏁 Sending interview_complete event to frontend")
+                    self.outbox.send({"type": "interview_complete"})
             else:
-                await self.speak_text(ai_text)
+                audio = self.brain.prerendered_audio.pop(ai_text, None)
+                await self.speak_text(ai_text, [(ai_text, audio)])
         except Exception as e:
             logger.error(f"❌ Generation Error: {e}")
 
-    async def speak_text(self, text):
-        import base64
-        await self.centrifugo.publish_text_message(self.session_id, text)
-        await self.centrifugo.publish_event(self.session_id, "speech_start")
-        
-        options = SpeakOptions(model="aura-asteria-en", encoding="mp3")
-        response = await asyncio.to_thread(
-            self.dg_client.speak.v("1").stream, {"text": text}, options
+    async def speak_text(self, text, segments=None):
+        """
+        Publish text + audio for one interviewer reply. `segments` is an optional
+        list of (text, audio) pairs; segments with pre-rendered audio skip TTS.
+        """
+        segments = segments or [(text, None)]
+        self.utterance_id += 1
+        self.utterance_transport = self.audio_transport  # fixed for the whole reply
+        # Queued on the outbox: they go out in one batch, ahead of the first audio chunk
+        self.outbox.text_message(text)
+        self.outbox.event(
+            "speech_start",
+            {"utterance": self.utterance_id, "audio_transport": self.audio_transport}
         )
         
-        def process_full_audio():
-            audio_bytes = b""
-            for chunk in response.stream:
-                if chunk: audio_bytes += chunk
-            
-            b64_audio = base64.b64encode(audio_bytes).decode('utf-8')
-            asyncio.run_coroutine_threadsafe(
-                self.centrifugo.publish(
-                    f"interviews:interview:{self.session_id}",
-                    {"type": "tts_audio_complete", "audio": b64_audio}
-                ),
-                self.loop
-            )
-
-        await asyncio.to_thread(process_full_audio)
-        await self.centrifugo.publish_event(self.session_id, "speech_end")
+        if settings.TTS_DELIVERY_MODE == "buffered":
+            await self._publish_buffered_audio(segments)
+        else:
+            await self._publish_streamed_audio(segments)
+        
+        self.outbox.event("speech_end")
         
         self.ai_finished_speaking_time = time.time()
         self.user_first_word_time = 0 # Reset for the next question
 
+    def _tts_audio(self, text):
+        pipeline = SentenceTTSPipeline(
+            self.speech,
+            self.loop,
+            max_concurrency=settings.TTS_PIPELINE_CONCURRENCY,
+            chunk_bytes=settings.TTS_STREAM_CHUNK_BYTES,
+            min_sentence_chars=settings.TTS_MIN_SENTENCE_CHARS,
+        )
+        return pipeline.stream(text, split=settings.TTS_SENTENCE_PIPELINE)
+
+    async def _segment_audio(self, segments):
+        for text, audio in segments:
+            if audio:
+                step = settings.TTS_STREAM_CHUNK_BYTES
+                for start in range(0, len(audio), step):
+                    yield audio[start:start + step]
+            else:
+                # aclosing: a cancelled turn must stop the sentence renders right away
+                async with aclosing(self._tts_audio(text)) as stream:
+                    async for chunk in stream:
+                        yield chunk
+
+    async def _publish_streamed_audio(self, segments):
+        """Relay MP3 chunks to the client in order while TTS is still synthesizing."""
+        started = time.time()
+        sequence = 0
+        try:
+            async with aclosing(self._segment_audio(segments)) as audio:
+                async for chunk in audio:
+                    if sequence == 0:
+                        logger.info(f"⏱️ Time to first audio: {time.time() - started:.2f}s")
+                        if self.connect_started is not None:
+                            connect_to_audio = time.monotonic() - self.connect_started
+                            self.connect_started = None
+                            metrics.observe("connect_to_first_audio_seconds", connect_to_audio)
+                            logger.info(f"⏱️ Connect to first audio: {connect_to_audio:.2f}s")
+                    await self._send_audio_chunk(chunk, sequence)
+                    sequence += 1
+        finally:
+            await self._send_audio_end(sequence)
+            logger.info(f"🔊 Streamed {sequence} TTS chunks in {time.time() - started:.2f}s")
+
+    async def _publish_buffered_audio(self, segments):
+        """Synthesize the full MP3 first and publish it as one tts_audio_complete message."""
+        import base64
+
+        async with aclosing(self._segment_audio(segments)) as audio:
+            audio_bytes = b"".join([chunk async for chunk in audio])
+        if self.utterance_transport == "websocket":
+            await self._send_audio_chunk(audio_bytes, 0)
+            await self._send_audio_end(1)
+            return
+        b64_audio = base64.b64encode(audio_bytes).decode('utf-8')
+        self.outbox.send({"type": "tts_audio_complete", "audio": b64_audio}, utterance=self.utterance_id)
+
+    def _choose_audio_transport(self, requested):
+        if requested in settings.AUDIO_TRANSPORTS_ALLOWED:
+            return requested
+        if requested:
+            logger.warning(f"⚠️ Audio transport '{requested}' not allowed, using {settings.AUDIO_TRANSPORT}")
+        return settings.AUDIO_TRANSPORT
+
+    async def _ack_audio_transport(self):
+        await self.send(text_data=json.dumps({"type": "audio_transport", "mode": self.audio_transport}))
+
+    async def _send_audio_chunk(self, chunk, sequence):
+        if self.utterance_transport == "websocket":
+            # 📦 Raw MP3 on the candidate's own socket: no base64, no extra hop
+            await self.send(bytes_data=encode_frame(KIND_AUDIO, "mp3", self.utterance_id, sequence, chunk))
+        else:
+            self.outbox.audio_chunk(chunk, sequence=sequence, audio_format="mp3", utterance=self.utterance_id)
+
+    async def _send_audio_end(self, total_chunks):
+        if self.utterance_transport == "websocket":
+            await self.send(bytes_data=encode_frame(KIND_END, "mp3", self.utterance_id, total_chunks))
+        else:
+            self.outbox.audio_end(total_chunks, audio_format="mp3", utterance=self.utterance_id)
+
     async def receive(self, bytes_data=None, text_data=None):
         if bytes_data:
-            try:
-                await asyncio.to_thread(self.dg_connection.send, bytes_data)
-            except Exception as e:
-                logger.error(f"❌ Deepgram Relay Error: {e}")
+            if self.audio_relay:
+                await self.audio_relay.push(bytes_data)
         elif text_data:
             try:
                 data = json.loads(text_data)
                 
                 if data.get("type") == "user_finished_speaking":
-                    final_text = getattr(self, 'transcript_buffer', "").strip()
-                    
-                    if final_text:
-                        pause_duration = 0
-                        if self.ai_finished_speaking_time > 0 and self.user_first_word_time > 0:
-                            pause_duration = round(self.user_first_word_time - self.ai_finished_speaking_time, 2)
-                            
-                        logger.info(f"🎤 USER CLICKED DONE. GAP: {pause_duration}s | TEXT: {final_text}")
-                        self.transcript_buffer = "" 
-                        
-                        asyncio.create_task(self.generate_response(final_text, pause_duration))
-                    else:
+                    # Manual override: ends the turn now, whatever the turn detector thinks
+                    if not self._end_turn("manual"):
                         logger.warning("⚠️ User clicked done, but they haven't spoken anything yet.")
+
+                elif data.get("type") == "audio_transport":
+                    # Takes effect from the next interviewer reply
+                    self.audio_transport = self._choose_audio_transport(data.get("mode"))
+                    await self._ack_audio_transport()
                         
             except Exception as e:
                 logger.error(f"❌ JSON Parse Error: {e}")
 
     async def disconnect(self, close_code):
+        get_keepalive_scheduler().unregister(self.channel_name)
+        if getattr(self, 'turn_detector', None):
+            self.turn_detector.reset()
+        if getattr(self, 'speculator', None):
+            self.speculator.cancel()
+        if getattr(self, 'turns', None):
+            self.turns.interrupt()
+        if getattr(self, 'intro_task', None) and not self.intro_task.done():
+            self.intro_task.cancel()
+        if getattr(self, 'audio_relay', None):
+            await self.audio_relay.close()
+        if getattr(self, 'outbox', None):
+            self.outbox.close()
         try:
-            await asyncio.to_thread(self.dg_connection.finish)
+            await asyncio.to_thread(self.stt.finish)
         except Exception as e:
-            logger.warning(f"⚠️ Deepgram disconnect error: {e}")
-        await self.centrifugo.close()
\ No newline at end of file
+            logger.warning(f"⚠️ STT disconnect error: {e}")
\ No newline at end of file
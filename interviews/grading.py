@@ -0,0 +1,195 @@
+"""
+Batched Background Grading
+Collects answers waiting for detailed grading from every interview in this
+worker process, grades them in batched Gemini requests and bulk-writes the
+resulting PerAnswerMetric rows.
+"""
+
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+from .models import PerAnswerMetric
+from .schemas import response_config
+from .utils import spawn_background
+from . import llm
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GradingJob:
+    """One answer waiting for detailed grading."""
+    session: Any
+    question: str
+    answer: str
+    decision: Dict[str, Any]
+    role_context: str
+    answer_fields: Dict[str, Any] = field(default_factory=dict)  # extra PerAnswerMetric fields (transcript segments, ...)
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+
+
+class GradingQueue:
+    """
+    Process-wide grading queue.
+
+    The worker flushes a batch when GRADING_BATCH_SIZE jobs are waiting or
+    GRADING_BATCH_WINDOW seconds have passed since the first one arrived.
+    At most GRADING_MAX_CONCURRENCY batches are in flight at once.
+    """
+
+    def __init__(self):
+        self.batch_size = settings.GRADING_BATCH_SIZE
+        self.batch_window = settings.GRADING_BATCH_WINDOW
+        self.max_retries = settings.GRADING_MAX_RETRIES
+        self.model_id = settings.GRADING_MODEL_ID
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.client = None
+
+    def enqueue(self, job: GradingJob):
+        """Queue an answer for grading; starts the worker on first use."""
+        self._ensure_worker()
+        self.queue.put_nowait(job)
+
+    def _ensure_worker(self):
+        if self.worker is None or self.worker.done():
+            self.queue = self.queue or asyncio.Queue()
+            self.semaphore = asyncio.Semaphore(settings.GRADING_MAX_CONCURRENCY)
+            self.client = self.client or llm.create_client()
+            self.worker = asyncio.create_task(self._run())
+            logger.info("🧮 Grading worker started")
+
+    async def _run(self):
+        while True:
+            batch = [await self.queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self.semaphore.acquire()
+            task = spawn_background(self._grade_batch(batch))
+            task.add_done_callback(lambda _: self.semaphore.release())
+
+    async def _grade_batch(self, batch: List[GradingJob]):
+        try:
+            grades = await self._request_grades(batch)
+        except Exception as e:
+            logger.error(f"❌ Grading batch of {len(batch)} failed: {e}")
+            grades = {}
+
+        done, retry = [], []
+        for index, job in enumerate(batch):
+            if index in grades:
+                done.append((job, {**job.decision, **grades[index]}))
+            elif job.attempts < self.max_retries:
+                retry.append(job)
+            else:
+                logger.warning("⚠️ Giving up on detailed grading, saving live scores only")
+                done.append((job, job.decision))
+
+        if done:
+            await self._save(done)
+
+        if retry:
+            attempt = max(job.attempts for job in retry) + 1
+            for job in retry:
+                job.attempts += 1
+            delay = min(30, 2 ** attempt) * (0.5 + random.random())
+            logger.info(f"🔁 Retrying {len(retry)} grading jobs in {delay:.1f}s")
+            asyncio.get_running_loop().call_later(
+                delay, lambda: [self.queue.put_nowait(job) for job in retry]
+            )
+
+    async def _request_grades(self, batch: List[GradingJob]) -> Dict[int, Dict[str, Any]]:
+        """One Gemini call for the whole batch; returns grades keyed by position."""
+        sections = []
+        for index, job in enumerate(batch):
+            sections.append(
+                f"### ANSWER {index}\n"
+                f"{job.role_context}\n"
+                f"Question: {job.question}\n"
+                f"Candidate Answer: {job.answer}\n"
+                f"Live scores: understanding {job.decision.get('understanding_score', 0)}/10, "
+                f"explainability {job.decision.get('explainability_score', 0)}/10\n"
+            )
+
+        prompt = (
+            "You are grading technical interview answers from several unrelated candidates. "
+            "Grade each answer independently, using only its own role and question.\n\n"
+            + "\n".join(sections) +
+            "\nFor EACH answer, add one entry to grades with its answer_index and:\n"
+            "- evidence_extracted: Exact quote from the answer that best supports the score.\n"
+            "- critique: Explain what was missing or wrong.\n"
+            "- ideal_answer: A 10/10 response example.\n"
+            "- technical_concepts_missed: Specific concepts (e.g., 'Indexing', 'N+1 queries').\n"
+            "- bias_flag: TRUE if the live scores look unfair given what the candidate actually said.\n"
+        )
+
+        config = response_config("batch_grading", settings.GRADING_TEMPERATURE)
+
+        started = time.monotonic()
+        response = await llm.generate_content(
+            self.client,
+            model=self.model_id,
+            contents=prompt,
+            config=config,
+            timeout=settings.LLM_BATCH_TIMEOUT
+        )
+        data = json.loads(response.text)
+        logger.info(f"🧮 Graded batch of {len(batch)} in {time.monotonic() - started:.2f}s")
+
+        grades = {}
+        for grade in data.get('grades') or []:
+            index = grade.pop('answer_index', None)
+            if isinstance(index, int) and 0 <= index < len(batch):
+                grades[index] = grade
+        return grades
+
+    async def _save(self, results):
+        metrics = []
+        for job, data in results:
+            metrics.append(PerAnswerMetric(
+                session=job.session,
+                question_asked=job.question,
+                candidate_answer=job.answer,
+                confidence_score=data.get('understanding_score', 0),
+                evidence_extracted=data.get('evidence_extracted', '') or '',
+                critique=data.get('critique', '') or '',
+                ideal_answer=data.get('ideal_answer', '') or '',
+                technical_concepts_missed=data.get('technical_concepts_missed') or [],
+                is_cheating_suspected=data.get('is_cheating', False) or False,
+                bias_flag=data.get('bias_flag', False) or False,
+                **job.answer_fields
+            ))
+        try:
+            await asyncio.to_thread(PerAnswerMetric.objects.bulk_create, metrics)
+            logger.info(f"✅ Bulk-saved {len(metrics)} graded answers")
+        except Exception as e:
+            logger.error(f"❌ Bulk grading save failed: {e}")
+
+
+_grading_queue: Optional[GradingQueue] = None
+
+
+def get_grading_queue() -> GradingQueue:
+    """Get the grading queue shared by every interview in this process."""
+    global _grading_queue
+    if _grading_queue is None:
+        _grading_queue = GradingQueue()
+    return _grading_queue
@@ -0,0 +1,92 @@
+"""
+Compact Interview State
+Structured per-session state rendered into the evaluation prompt in place of
+verbatim transcripts: skill coverage, running scores, drill depth and short
+digests of recent answers, trimmed to a token budget.
+"""
+
+
+from collections import deque
+from typing import Dict, List, Optional
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting before the request is sent."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def digest(text: str, max_words: int = 20) -> str:
+    words = text.split()
+    if len(words) <= max_words:
+        return " ".join(words)
+    return " ".join(words[:max_words]) + " …"
+
+
+class SkillCoverage:
+    __slots__ = ("name", "asked", "best")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.asked = 0
+        self.best: Optional[int] = None
+
+
+class InterviewState:
+    """Everything the evaluation prompt needs to know about the interview so far."""
+
+    def __init__(self, skills: List[str], max_digests: int = 3, digest_words: int = 20):
+        self.coverage: Dict[str, SkillCoverage] = {}
+        for skill in skills:
+            self.coverage.setdefault(skill.lower(), SkillCoverage(skill))
+        self.digests = deque(maxlen=max_digests)
+        self.digest_words = digest_words
+        self.scored_turns = 0
+        self.understanding_total = 0
+        self.explainability_total = 0
+        self.last_scores = None
+
+    def record(self, question: str, answer: str, understanding: int,
+               explainability: Optional[int] = None, topic: Optional[str] = None):
+        """Fold one graded exchange into the state."""
+        skill = self.coverage.get((topic or "").strip().lower())
+        if skill:
+            skill.asked += 1
+            skill.best = understanding if skill.best is None else max(skill.best, understanding)
+
+        self.scored_turns += 1
+        self.understanding_total += understanding or 0
+        self.explainability_total += explainability or 0
+        self.last_scores = (understanding, explainability)
+        self.digests.append((skill.name if skill else None, understanding, digest(question, 12), digest(answer, self.digest_words)))
+
+    def render(self, drill_depth: int, max_digests: Optional[int] = None) -> str:
+        coverage = " | ".join(
+            f"{s.name}={s.asked}q" + (f"/best {s.best}" if s.best is not None else "")
+            for s in self.coverage.values()
+        )
+        lines = [f"Skill coverage (questions/best score): {coverage}"]
+
+        if self.scored_turns:
+            lines.append(
+                f"Running scores: avg understanding {self.understanding_total / self.scored_turns:.1f}, "
+                f"avg explainability {self.explainability_total / self.scored_turns:.1f}, "
+                f"last {self.last_scores[0]}/{self.last_scores[1]}, turns {self.scored_turns}"
+            )
+        lines.append(f"Drill depth: {drill_depth}")
+
+        digests = list(self.digests)
+        if max_digests is not None:
+            digests = digests[len(digests) - max_digests:] if max_digests > 0 else []
+        for skill, score, question, answer in digests:
+            lines.append(f"- [{skill or 'general'} · {score}/10] Q: {question} A: {answer}")
+        return "\n".join(lines)
+
+    def render_within_budget(self, drill_depth: int, fixed_tokens: int, budget: int) -> str:
+        """Render, dropping the oldest digests until the whole prompt fits the budget."""
+        for keep in range(len(self.digests), -1, -1):
+            text = self.render(drill_depth, max_digests=keep)
+            if fixed_tokens + estimate_tokens(text) <= budget:
+                return text
+        return text
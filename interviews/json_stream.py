@@ -0,0 +1,112 @@
+"""
+Incremental JSON Field Extractor
+Scans a streamed JSON object and reports top-level fields as soon as they close,
+so the consumer can act on early fields while the rest is still generating.
+"""
+
+
+import json
+from typing import Any, Dict
+
+
+class JSONFieldExtractor:
+    """
+    Feed text fragments of a single JSON object; completed top-level fields
+    are decoded into `values` the moment their closing token arrives.
+
+    Only top-level members are tracked. Nested arrays/objects are captured
+    as raw text and decoded once their closing bracket is seen.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key = None
+        self._raw = []
+        self._capturing = False
+
+    def feed(self, text: str) -> Dict[str, Any]:
+        """Consume a fragment and return the fields completed by it."""
+        completed = {}
+        for ch in text:
+            if self._in_string:
+                if self._capturing:
+                    self._raw.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._close_top_level_string(completed)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._capturing = True
+                    self._raw = ['"']
+                elif self._capturing:
+                    self._raw.append(ch)
+            elif ch in '{[':
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+                elif self._depth == 2 and not self._capturing:
+                    self._capturing = True
+                    self._raw = [ch]
+                elif self._capturing:
+                    self._raw.append(ch)
+            elif ch in '}]':
+                if self._capturing:
+                    if self._depth == 1:
+                        self._close_scalar(completed)
+                    else:
+                        self._raw.append(ch)
+                self._depth -= 1
+                if self._depth == 1 and self._capturing:
+                    self._close_value(''.join(self._raw), completed)
+            elif self._depth == 1 and ch == ':':
+                self._expect_key = False
+            elif self._depth == 1 and ch == ',':
+                if self._capturing:
+                    self._close_scalar(completed)
+                self._expect_key = True
+            elif self._depth == 1 and not ch.isspace():
+                # Start (or continuation) of a number / true / false / null
+                if not self._capturing:
+                    self._capturing = True
+                    self._raw = []
+                self._raw.append(ch)
+            elif self._capturing and self._depth > 1:
+                self._raw.append(ch)
+
+        return completed
+
+    def _close_top_level_string(self, completed):
+        raw = ''.join(self._raw)
+        self._capturing = False
+        if self._expect_key:
+            self._key = json.loads(raw)
+        else:
+            self._store(json.loads(raw), completed)
+
+    def _close_scalar(self, completed):
+        raw = ''.join(self._raw).strip()
+        self._capturing = False
+        if raw:
+            self._store(json.loads(raw), completed)
+
+    def _close_value(self, raw, completed):
+        self._capturing = False
+        self._store(json.loads(raw), completed)
+
+    def _store(self, value, completed):
+        if self._key is not None:
+            self.values[self._key] = value
+            completed[self._key] = value
+            self._key = None
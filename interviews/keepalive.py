@@ -0,0 +1,99 @@
+"""
+Shared Deepgram Keepalive Scheduler
+One task per worker process tracks every live Deepgram connection and sends
+a KeepAlive only to those that have been idle (no audio or keepalive sent)
+for KEEPALIVE_IDLE seconds.
+"""
+
+
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+
+from .metrics import metrics
+from .utils import spawn_background
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_MESSAGE = json.dumps({"type": "KeepAlive"})
+
+
+class TrackedConnection:
+    __slots__ = ("key", "send", "last_activity", "last_ping", "in_flight")
+
+    def __init__(self, key: str, send: Callable[[str], object], last_activity: Callable[[], float]):
+        self.key = key
+        self.send = send
+        self.last_activity = last_activity
+        self.last_ping = time.monotonic()
+        self.in_flight = False
+
+    def idle_for(self, now: float) -> float:
+        return now - max(self.last_activity() or 0.0, self.last_ping)
+
+
+class KeepaliveScheduler:
+    """
+    Process-wide keepalive loop.
+
+    Connections register on connect and unregister on disconnect; the loop
+    stops itself when nothing is tracked and restarts on the next register.
+    """
+
+    def __init__(self):
+        self.idle_after = settings.KEEPALIVE_IDLE
+        self.tick = settings.KEEPALIVE_TICK
+        self.connections: Dict[str, TrackedConnection] = {}
+        self.worker: Optional[asyncio.Task] = None
+
+    def register(self, key: str, send: Callable[[str], object], last_activity: Callable[[], float]):
+        """Track a connection. `last_activity` returns the time.monotonic() of the last audio sent."""
+        self.connections[key] = TrackedConnection(key, send, last_activity)
+        metrics.set_gauge("keepalive_tracked_connections", len(self.connections))
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self._run())
+            logger.info("💓 Keepalive scheduler started")
+
+    def unregister(self, key: str):
+        if self.connections.pop(key, None) is not None:
+            metrics.set_gauge("keepalive_tracked_connections", len(self.connections))
+
+    async def _run(self):
+        while self.connections:
+            await asyncio.sleep(self.tick)
+            now = time.monotonic()
+            for conn in list(self.connections.values()):
+                if not conn.in_flight and conn.idle_for(now) >= self.idle_after:
+                    conn.in_flight = True
+                    # Not gathered: one slow socket mustn't delay the other pings
+                    spawn_background(self._ping(conn))
+        logger.info("💓 Keepalive scheduler idle")
+
+    async def _ping(self, conn: TrackedConnection):
+        try:
+            await asyncio.to_thread(conn.send, KEEPALIVE_MESSAGE)
+            conn.last_ping = time.monotonic()
+            metrics.incr("keepalive_sent_total")
+        except Exception as e:
+            # The socket is gone; stop pinging it even if disconnect never runs
+            logger.warning(f"⚠️ Keepalive failed for {conn.key}, untracking: {e}")
+            metrics.incr("keepalive_failures_total")
+            if self.connections.get(conn.key) is conn:
+                self.unregister(conn.key)
+        finally:
+            conn.in_flight = False
+
+
+_keepalive_scheduler: Optional[KeepaliveScheduler] = None
+
+
+def get_keepalive_scheduler() -> KeepaliveScheduler:
+    """Get the keepalive scheduler shared by every interview in this process."""
+    global _keepalive_scheduler
+    if _keepalive_scheduler is None:
+        _keepalive_scheduler = KeepaliveScheduler()
+    return _keepalive_scheduler
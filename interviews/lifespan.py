@@ -0,0 +1,56 @@
+"""
+Worker Shutdown Handling
+Closes process-wide clients (the pooled Centrifugo publisher) when the
+server shuts the worker down, so keep-alive connections are released cleanly.
+Servers that speak ASGI lifespan get LifespanApp; daphne never sends those
+events, so the same cleanup is also hooked into Twisted's reactor shutdown.
+"""
+
+
+import asyncio
+import logging
+import sys
+
+from .centrifugo_client import shutdown_centrifugo_publisher
+
+logger = logging.getLogger(__name__)
+
+
+async def shutdown_worker():
+    """Release shared clients. Safe to run twice (lifespan and reactor hooks)."""
+    try:
+        await shutdown_centrifugo_publisher()
+    except Exception as e:
+        logger.warning(f"⚠️ Centrifugo pool shutdown error: {e}")
+    logger.info("👋 Worker shutdown complete")
+
+
+class LifespanApp:
+    """ASGI app for the 'lifespan' scope; shared clients start lazily, so startup is a no-op."""
+
+    async def __call__(self, scope, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await shutdown_worker()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def install_reactor_shutdown_hook():
+    """
+    Run shutdown_worker() before the Twisted reactor stops (daphne). No-op
+    when no reactor has been installed, so other servers aren't affected.
+    """
+    if "twisted.internet.reactor" not in sys.modules:
+        return
+    from twisted.internet import reactor
+    from twisted.internet.defer import Deferred
+
+    def before_shutdown():
+        # daphne runs Twisted on its asyncio loop; the reactor waits for this Deferred
+        return Deferred.fromFuture(asyncio.ensure_future(shutdown_worker()))
+
+    reactor.addSystemEventTrigger("before", "shutdown", before_shutdown)
@@ -0,0 +1,249 @@
+"""
+Async Gemini Gateway
+Runs every Gemini request on the SDK's native async client (client.aio) with a
+per-call timeout and a process-wide concurrency limit, so slow LLM calls never
+hold threads from the default executor. Live turns additionally get retries
+with jitter, per-model circuit breakers and hedging to a secondary model.
+"""
+
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+from .metrics import metrics, TOKEN_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def create_client():
+    """Build a Gemini client (sync; run it in a thread on hot paths)."""
+    from google import genai
+
+    return genai.Client(api_key=settings.GEMINI_API_KEY)
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    return _semaphore
+
+
+def record_usage(model: str, usage):
+    """Count prompt/output tokens from a response's usage_metadata."""
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_token_count", None) or 0
+    output_tokens = getattr(usage, "candidates_token_count", None) or 0
+    cached_tokens = getattr(usage, "cached_content_token_count", None) or 0
+    metrics.observe("llm_prompt_tokens", prompt_tokens, buckets=TOKEN_BUCKETS, model=model)
+    metrics.incr("llm_prompt_tokens_total", prompt_tokens, model=model)
+    metrics.incr("llm_output_tokens_total", output_tokens, model=model)
+    metrics.incr("llm_cached_tokens_total", cached_tokens, model=model)
+    logger.info(f"🧾 {model} tokens | prompt: {prompt_tokens} (cached {cached_tokens}) | output: {output_tokens}")
+
+
+@asynccontextmanager
+async def llm_slot(model: str, kind: str):
+    """Hold one of the process-wide LLM slots and record in-flight/latency metrics."""
+    semaphore = _get_semaphore()
+    waited = time.monotonic()
+    async with semaphore:
+        metrics.observe("llm_slot_wait_seconds", time.monotonic() - waited)
+        metrics.add_gauge("llm_in_flight", 1)
+        metrics.add_gauge("llm_in_flight", 1, model=model)
+        started = time.monotonic()
+        status = "ok"
+        try:
+            yield
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            metrics.add_gauge("llm_in_flight", -1)
+            metrics.add_gauge("llm_in_flight", -1, model=model)
+            metrics.observe("llm_call_seconds", time.monotonic() - started, model=model, kind=kind)
+            metrics.incr("llm_calls_total", model=model, kind=kind, status=status)
+
+
+async def generate_content(client, *, model: str, contents: Any, config=None, timeout: Optional[float] = None):
+    """Single structured/unstructured generate call."""
+    async with llm_slot(model, "generate"):
+        async with asyncio.timeout(timeout or settings.LLM_TIMEOUT):
+            response = await client.aio.models.generate_content(model=model, contents=contents, config=config)
+    record_usage(model, response.usage_metadata)
+    return response
+
+
+async def stream_content(client, *, model: str, contents: Any, config=None, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+    """Streaming generate call; the timeout covers the whole stream."""
+    usage = None
+    async with llm_slot(model, "stream"):
+        async with asyncio.timeout(timeout or settings.LLM_STREAM_TIMEOUT):
+            async for chunk in await client.aio.models.generate_content_stream(
+                model=model, contents=contents, config=config
+            ):
+                usage = chunk.usage_metadata or usage
+                yield chunk
+    record_usage(model, usage)
+
+
+async def send_chat_message(chat, model: str, message: str, timeout: Optional[float] = None):
+    """Send a message on an async chat session (client.aio.chats)."""
+    async with llm_slot(model, "chat"):
+        async with asyncio.timeout(timeout or settings.LLM_TIMEOUT):
+            return await chat.send_message(message)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a model's circuit breaker is open and the call is skipped."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. Once `cooldown`
+    seconds have passed, probe calls are let through again (half-open);
+    one success closes it, another failure re-opens it.
+    """
+
+    def __init__(self, model: str, failure_threshold: int, cooldown: float,
+                 metric_prefix: str = "llm", labels: Optional[Dict[str, str]] = None):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.metric_prefix = metric_prefix
+        self.labels = {"model": model} if labels is None else labels
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        return time.monotonic() - self.opened_at >= self.cooldown
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is let through (0 when closed or half-open)."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"🟢 Circuit closed for {self.model}")
+        self.failures = 0
+        self.opened_at = None
+        metrics.set_gauge(f"{self.metric_prefix}_circuit_open", 0, **self.labels)
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"🔴 Circuit opened for {self.model} after {self.failures} failures")
+                metrics.incr(f"{self.metric_prefix}_circuit_trips_total", **self.labels)
+            self.opened_at = time.monotonic()
+            metrics.set_gauge(f"{self.metric_prefix}_circuit_open", 1, **self.labels)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(model: str) -> CircuitBreaker:
+    if model not in _breakers:
+        _breakers[model] = CircuitBreaker(
+            model, settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_COOLDOWN
+        )
+    return _breakers[model]
+
+
+async def call_with_retries(model: str, fn: Callable[[str], Awaitable[Any]]):
+    """Call fn(model), retrying failures with full-jitter exponential backoff."""
+    breaker = get_breaker(model)
+    for attempt in range(settings.LLM_MAX_RETRIES + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(model)
+        try:
+            result = await fn(model)
+        except Exception as e:
+            breaker.record_failure()
+            if attempt == settings.LLM_MAX_RETRIES:
+                raise
+            delay = random.uniform(0, settings.LLM_RETRY_BASE_DELAY * 2 ** attempt)
+            logger.warning(f"🔁 {model} failed ({e}), retry {attempt + 1} in {delay:.2f}s")
+            metrics.incr("llm_retries_total", model=model)
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
+
+
+async def hedged(fn: Callable[[str], Awaitable[Any]], models: List[str],
+                 hedge_delay: Optional[float] = None, budget: Optional[float] = None,
+                 discard: Optional[Callable[[Any], None]] = None):
+    """
+    Run fn(model) against the first healthy model; if it hasn't produced a valid
+    result after `hedge_delay` seconds (or has failed), launch the next model.
+    The first successful result wins and the other attempts are cancelled and
+    awaited; `discard` releases any losing result that had already completed.
+    The whole race is bounded by `budget` seconds.
+    """
+    hedge_delay = settings.LLM_HEDGE_DELAY if hedge_delay is None else hedge_delay
+    budget = settings.LLM_TURN_BUDGET if budget is None else budget
+
+    candidates = [m for m in dict.fromkeys(models) if m and get_breaker(m).allow()]
+    if not candidates:
+        raise CircuitOpenError(", ".join(m for m in models if m))
+
+    launched: Dict[asyncio.Task, str] = {}
+    errors = []
+    started = time.monotonic()
+    try:
+        async with asyncio.timeout(budget):
+            while candidates or launched:
+                if candidates:
+                    model = candidates.pop(0)
+                    launched[asyncio.create_task(call_with_retries(model, fn))] = model
+                    if len(launched) + len(errors) > 1:
+                        logger.info(f"🏎️ Hedging request to {model}")
+                        metrics.incr("llm_hedges_total", model=model)
+
+                done, _ = await asyncio.wait(
+                    list(launched),
+                    timeout=hedge_delay if candidates else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    model = launched.pop(task)
+                    if task.exception() is None:
+                        metrics.incr("llm_hedge_wins_total", model=model)
+                        metrics.observe("llm_turn_seconds", time.monotonic() - started, model=model)
+                        return task.result()
+                    errors.append(task.exception())
+                    logger.warning(f"⚠️ {model} attempt failed: {task.exception()}")
+    except TimeoutError:
+        metrics.incr("llm_budget_exceeded_total")
+        logger.error(f"⏰ LLM turn budget of {budget}s exceeded waiting on {', '.join(launched.values())}")
+        raise
+    finally:
+        await _settle_losers(list(launched), discard)
+
+    raise errors[-1]
+
+
+async def _settle_losers(tasks: List[asyncio.Task], discard: Optional[Callable[[Any], None]]):
+    """Cancel attempts that didn't win and wait for them, so none keeps running or leaks its result."""
+    for task in tasks:
+        task.cancel()
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if discard is not None and not isinstance(result, BaseException):
+            discard(result)
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_alter_user_managers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewOpener',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('intro', 'Intro'), ('opening_question', 'Opening Question')], max_length=30)),
+                ('text', models.TextField()),
+                ('audio', models.BinaryField(blank=True, null=True)),
+                ('audio_format', models.CharField(default='mp3', max_length=10)),
+                ('rubric_fingerprint', models.CharField(max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='openers', to='interviews.jobposting')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_interviewopener'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='peranswermetric',
+            name='transcript_segments',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_peranswermetric_transcript_segments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='peranswermetric',
+            name='speech_features',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-17 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0005_peranswermetric_speech_features'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='peranswermetric',
+            name='explainability_score',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='peranswermetric',
+            name='topic',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
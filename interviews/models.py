@@ -86,11 +86,15 @@ class PerAnswerMetric(models.Model):
     candidate_answer = models.TextField()
     
     confidence_score = models.IntegerField(null=True, blank=True) 
+    explainability_score = models.IntegerField(null=True, blank=True)
+    topic = models.CharField(max_length=100, blank=True, default='')  # skill from the coverage list this answer addressed
     evidence_extracted = models.TextField(null=True, blank=True)
     
     critique = models.TextField(null=True, blank=True)  
     ideal_answer = models.TextField(null=True, blank=True)  
     technical_concepts_missed = models.JSONField(default=list)  
+    speech_features = models.JSONField(default=dict, blank=True)  # local speaking-rate / pause / filler features
+    transcript_segments = models.JSONField(default=list, blank=True)  # [{text, start, end, confidence, words: [[w, start, end, conf]]}]
     
     is_cheating_suspected = models.BooleanField(default=False)
     cheating_reason = models.CharField(max_length=255, null=True, blank=True)
@@ -99,4 +103,27 @@ class PerAnswerMetric(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Q&A for Session {self.session.id} - Score: {self.confidence_score}"
\ No newline at end of file
+        return f"Q&A for Session {self.session.id} - Score: {self.confidence_score}"
+
+class InterviewOpener(models.Model):
+    """Pre-generated intro / opening question (+ TTS audio) for a JobPosting."""
+    KIND_INTRO = 'intro'
+    KIND_OPENING_QUESTION = 'opening_question'
+    KIND_CHOICES = [
+        (KIND_INTRO, 'Intro'),
+        (KIND_OPENING_QUESTION, 'Opening Question'),
+    ]
+
+    job = models.ForeignKey(JobPosting, related_name='openers', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    text = models.TextField()
+    audio = models.BinaryField(null=True, blank=True)
+    audio_format = models.CharField(max_length=10, default='mp3')
+
+    # Fingerprint of job.rubric_template the opener was generated from
+    rubric_fingerprint = models.CharField(max_length=32)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.job.title}"
@@ -0,0 +1,132 @@
+"""
+Interview Opener Bank
+Pre-generates intros and opening questions (with their TTS audio) per
+JobPosting, so an interview can start speaking without a live LLM or TTS
+round-trip. Only the candidate's greeting is synthesized at session start.
+"""
+
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+
+from django.conf import settings
+from django.db import transaction
+
+from . import llm
+from .models import InterviewOpener, JobPosting
+from .schemas import response_config
+from .speech_providers import get_speech_provider
+from .tts import TTS_ENCODING, synthesize
+from .utils import run_in_background
+
+logger = logging.getLogger(__name__)
+
+_building = set()
+
+
+def rubric_fingerprint(rubric_template) -> str:
+    payload = json.dumps(rubric_template or {}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def personalize_greeting(candidate_name):
+    first_name = (candidate_name or "").strip().split(" ")[0]
+    return f"Hi {first_name}!" if first_name else "Hi there!"
+
+
+def load_opener_bank(job):
+    """
+    Pick a random intro and opening question generated from the job's current
+    rubric. Returns (intro, opening_question); either may be None.
+    """
+    fingerprint = rubric_fingerprint(job.rubric_template)
+    openers = list(InterviewOpener.objects.filter(job=job, rubric_fingerprint=fingerprint))
+    intros = [o for o in openers if o.kind == InterviewOpener.KIND_INTRO]
+    questions = [o for o in openers if o.kind == InterviewOpener.KIND_OPENING_QUESTION]
+    return (
+        random.choice(intros) if intros else None,
+        random.choice(questions) if questions else None,
+    )
+
+
+def schedule_opener_bank(job_id):
+    """Kick off a background (re)build of a job's opener bank from sync code."""
+    run_in_background(build_opener_bank, job_id)
+
+
+async def build_opener_bank(job_id):
+    """Generate intros + opening questions for a job, synthesize them and replace its bank."""
+    job_id = str(job_id)
+    if job_id in _building:
+        return
+    _building.add(job_id)
+    try:
+        job = await asyncio.to_thread(JobPosting.objects.get, id=job_id)
+        rubric = job.rubric_template or {}
+        languages = ", ".join(rubric.get('languages', ['General Programming']))
+        skills = ", ".join(rubric.get('core_skills', ['Core Concepts']))
+        level = rubric.get('experience_level', 'Mid-Level')
+
+        prompt = (
+            f"You are the AI Interviewer for a {level} {job.title} role. "
+            f"Languages/Technologies: {languages}. Core Skills: {skills}.\n\n"
+            f"1. Write {settings.OPENER_BANK_INTROS} different interview intros. Each one introduces you as "
+            f"the AI Interviewer for the {job.title} role, briefly mentions we'll be discussing {languages} "
+            "and related technical skills, and ends by asking if they are ready to begin. Keep each natural "
+            "and under 3 short sentences. Do NOT greet the candidate or use a name; a personal greeting is "
+            "played right before the intro.\n"
+            f"2. Write {settings.OPENER_BANK_QUESTIONS} different opening technical questions, each on a "
+            "different skill or language from the list. Maximum 2 sentences, casual and human, ending with "
+            "ONE clear question."
+        )
+
+        client = llm.create_client()
+        response = await llm.generate_content(
+            client,
+            model=settings.OPENER_MODEL_ID,
+            contents=prompt,
+            config=response_config("openers", 0.9)
+        )
+        data = json.loads(response.text)
+        texts = [(InterviewOpener.KIND_INTRO, t) for t in (data.get('intros') or [])[:settings.OPENER_BANK_INTROS]]
+        texts += [(InterviewOpener.KIND_OPENING_QUESTION, t) for t in (data.get('opening_questions') or [])[:settings.OPENER_BANK_QUESTIONS]]
+        if not texts:
+            logger.warning(f"⚠️ Opener bank for job {job_id[:8]} came back empty")
+            return
+
+        speech = get_speech_provider()
+        semaphore = asyncio.Semaphore(settings.TTS_PIPELINE_CONCURRENCY)
+
+        async def render(text):
+            async with semaphore:
+                return await synthesize(speech, text, max_concurrency=1)
+
+        audios = await asyncio.gather(*(render(text) for _, text in texts), return_exceptions=True)
+
+        fingerprint = rubric_fingerprint(job.rubric_template)
+        openers = [
+            InterviewOpener(
+                job=job,
+                kind=kind,
+                text=text,
+                audio=audio if isinstance(audio, bytes) else None,
+                audio_format=TTS_ENCODING,
+                rubric_fingerprint=fingerprint,
+            )
+            for (kind, text), audio in zip(texts, audios)
+        ]
+        await asyncio.to_thread(_replace_bank, job, openers)
+        logger.info(f"🎙️ Opener bank ready for job {job_id[:8]}: {len(openers)} entries")
+    except Exception as e:
+        logger.error(f"❌ Opener bank build failed for job {job_id[:8]}: {e}")
+    finally:
+        _building.discard(job_id)
+
+
+def _replace_bank(job, openers):
+    with transaction.atomic():
+        InterviewOpener.objects.filter(job=job).delete()
+        InterviewOpener.objects.bulk_create(openers)
@@ -0,0 +1,200 @@
+"""
+Per-Session Publish Outbox
+The consumer enqueues Centrifugo publications and moves on; one background
+task per session delivers them in order, retrying with backoff. A shared
+circuit breaker pauses delivery while Centrifugo is failing, and non-critical
+events are shed when the breaker is open or the queue backs up.
+"""
+
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+from django.conf import settings
+
+from .centrifugo_client import (
+    CentrifugoPublisher,
+    audio_chunk_payload,
+    audio_end_payload,
+    event_payload,
+    interview_channel,
+    text_message_payload,
+)
+from .llm import CircuitBreaker
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Drain tasks outlive their consumer (disconnect doesn't wait for delivery); keep them referenced
+_draining: Set[asyncio.Task] = set()
+
+# Events the client acts on: speech_start carries the utterance id, speech_interrupted stops playback
+CRITICAL_EVENTS = {"speech_start", "speech_interrupted"}
+
+
+class OutboxItem:
+    __slots__ = ("data", "critical", "utterance", "attempts", "enqueued_at")
+
+    def __init__(self, data: Any, critical: bool, utterance: Optional[int] = None):
+        self.data = data
+        self.critical = critical
+        self.utterance = utterance
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+
+
+def is_critical(data: Any) -> bool:
+    """Text, audio, completion markers and CRITICAL_EVENTS must arrive; other events are best effort."""
+    if isinstance(data, dict) and data.get("type") == "event":
+        return data.get("event") in CRITICAL_EVENTS
+    return True
+
+
+class PublishOutbox:
+    """
+    Ordered, bounded publish queue for one interview channel. Enqueue methods
+    are sync and never wait on Centrifugo. All methods run on the event loop.
+
+    Delivery is at-least-once: when part of a round fails, the first failed
+    publication and everything after it are retried, so order is preserved.
+    """
+
+    def __init__(self, publisher: CentrifugoPublisher, session_id: str):
+        self.publisher = publisher
+        self.session_id = session_id
+        self.channel = interview_channel(session_id)
+        self.queue: Deque[OutboxItem] = deque()
+        self.task: Optional[asyncio.Task] = None
+        self.breaker = get_centrifugo_breaker()
+        self.max_events = max(1, settings.OUTBOX_MAX_EVENTS)
+        self.shed_depth = settings.OUTBOX_SHED_DEPTH
+        # Without the batcher, concurrent publishes could overtake each other: send one at a time
+        self.round_size = max(1, settings.OUTBOX_BATCH) if settings.CENTRIFUGO_BATCHING else 1
+
+    def text_message(self, message: str, message_type: str = "interviewer"):
+        self.send(text_message_payload(message, message_type))
+
+    def event(self, event_type: str, event_data: Optional[Dict[str, Any]] = None):
+        self.send(event_payload(event_type, event_data))
+
+    def audio_chunk(self, audio_chunk: bytes, sequence: Optional[int] = None, audio_format: str = "pcm16",
+                    utterance: Optional[int] = None):
+        self.send(audio_chunk_payload(audio_chunk, sequence, audio_format), utterance=utterance)
+
+    def audio_end(self, total_chunks: int, audio_format: str = "pcm16", utterance: Optional[int] = None):
+        self.send(audio_end_payload(total_chunks, audio_format), utterance=utterance)
+
+    def send(self, data: Any, critical: Optional[bool] = None, utterance: Optional[int] = None):
+        """Queue a publication; `utterance` tags reply audio so drop_utterance() can discard it."""
+        critical = is_critical(data) if critical is None else critical
+        if not critical and (not self.breaker.allow() or len(self.queue) >= self.shed_depth):
+            self._dropped(1, "shed")
+            return
+        if len(self.queue) >= self.max_events:
+            self._evict()
+        self.queue.append(OutboxItem(data, critical, utterance))
+        metrics.add_gauge("outbox_queue_depth", 1)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._drain())
+            _draining.add(self.task)
+            self.task.add_done_callback(_draining.discard)
+
+    def drop_utterance(self, utterance: int):
+        """Barge-in: queued audio of the cancelled reply must not play ahead of speech_interrupted."""
+        kept = deque(item for item in self.queue if item.utterance != utterance)
+        dropped = len(self.queue) - len(kept)
+        if dropped:
+            self.queue = kept
+            metrics.add_gauge("outbox_queue_depth", -dropped)
+            self._dropped(dropped, "interrupted")
+
+    def close(self):
+        """
+        The candidate is gone: drop queued speech events, let the rest finish
+        delivering in the background (disconnect doesn't wait for it).
+        """
+        self._shed_queued()
+        if self.queue:
+            logger.info(f"📮 Outbox for {self.session_id} still delivering {len(self.queue)} publications")
+
+    async def _drain(self):
+        while self.queue:
+            wait = self.breaker.retry_in()
+            if wait > 0:
+                self._shed_queued()
+                await asyncio.sleep(wait)
+                continue
+
+            batch = [self.queue.popleft() for _ in range(min(self.round_size, len(self.queue)))]
+            metrics.add_gauge("outbox_queue_depth", -len(batch))
+            # Started in order, so the batcher queues them in order too
+            results = await asyncio.gather(*(self.publisher.publish(self.channel, item.data) for item in batch))
+
+            failed = next((i for i, result in enumerate(results) if "error" in result), len(batch))
+            now = time.monotonic()
+            for item in batch[:failed]:
+                metrics.observe("outbox_delivery_seconds", now - item.enqueued_at)
+            metrics.incr("outbox_delivered_total", failed)
+            if failed == len(batch):
+                self.breaker.record_success()
+                continue
+
+            self.breaker.record_failure()
+            retry = batch[failed:]
+            head = retry[0]
+            head.attempts += 1
+            if head.attempts > settings.OUTBOX_MAX_RETRIES:
+                logger.error(f"❌ Dropping {head.data.get('type', 'publication')} for {self.session_id} "
+                             f"after {settings.OUTBOX_MAX_RETRIES} retries: {results[failed].get('error')}")
+                self._dropped(1, "retries")
+                retry = retry[1:]
+                head.attempts = 0
+            self.queue.extendleft(reversed(retry))
+            metrics.add_gauge("outbox_queue_depth", len(retry))
+            metrics.incr("outbox_retries_total")
+            await asyncio.sleep(self._backoff(max(head.attempts, 1)))
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(settings.OUTBOX_RETRY_MAX, settings.OUTBOX_RETRY_BASE * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _evict(self):
+        """Queue full: drop the oldest non-critical item, else the oldest item."""
+        victim = next((item for item in self.queue if not item.critical), self.queue[0])
+        self.queue.remove(victim)
+        metrics.add_gauge("outbox_queue_depth", -1)
+        self._dropped(1, "overflow")
+        logger.warning(f"⚠️ Outbox for {self.session_id} full ({self.max_events}), dropped oldest "
+                       f"{'critical' if victim.critical else 'non-critical'} publication")
+
+    def _shed_queued(self):
+        kept = deque(item for item in self.queue if item.critical)
+        shed = len(self.queue) - len(kept)
+        if shed:
+            self.queue = kept
+            metrics.add_gauge("outbox_queue_depth", -shed)
+            self._dropped(shed, "shed")
+
+    def _dropped(self, count: int, reason: str):
+        metrics.incr("outbox_dropped_total", count, reason=reason)
+
+
+_breaker: Optional[CircuitBreaker] = None
+
+
+def get_centrifugo_breaker() -> CircuitBreaker:
+    """One breaker for the Centrifugo API, shared by every outbox in this process."""
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker(
+            "centrifugo",
+            settings.CENTRIFUGO_BREAKER_FAILURES,
+            settings.CENTRIFUGO_BREAKER_COOLDOWN,
+            metric_prefix="centrifugo",
+            labels={},
+        )
+    return _breaker
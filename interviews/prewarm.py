@@ -0,0 +1,104 @@
+"""
+Lobby-Time Pre-Warming
+When the candidate hits the connect endpoint, build the InterviewerBrain and
+render the intro audio in the background so the websocket consumer can pick
+up a ready pipeline instead of building it on demand.
+"""
+
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from .metrics import metrics
+from .services import InterviewerBrain
+from .speech_providers import get_speech_provider
+from .tts import synthesize
+from .utils import run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+class WarmSession:
+    __slots__ = ("session_id", "task", "expires_at")
+
+    def __init__(self, session_id: str, task: asyncio.Task, expires_at: float):
+        self.session_id = session_id
+        self.task = task
+        self.expires_at = expires_at
+
+
+_warm: Dict[str, WarmSession] = {}
+
+
+def schedule_prewarm(session_id):
+    """Start pre-warming a session from sync view code (no-op if disabled)."""
+    if settings.PREWARM_ENABLED:
+        run_in_background(prewarm_session, str(session_id))
+
+
+async def prewarm_session(session_id: str):
+    _purge_expired()
+    if session_id in _warm:
+        return
+    task = asyncio.create_task(_build(session_id))
+    _warm[session_id] = WarmSession(session_id, task, time.monotonic() + settings.PREWARM_TTL)
+    metrics.set_gauge("prewarm_sessions", len(_warm))
+    logger.info(f"🔥 Pre-warming session {session_id[:8]}")
+
+
+async def _build(session_id: str):
+    started = time.monotonic()
+    brain = await asyncio.to_thread(InterviewerBrain, session_id)
+    # Only the opener bank's intro: a live LLM intro (and the session writes of starting
+    # the interview) wait until the candidate actually connects
+    segments = await brain.get_intro_segments(allow_live=False)
+
+    rendered = None
+    if segments is not None:
+        speech = get_speech_provider()
+        rendered = []
+        for text, audio in segments:
+            rendered.append((text, audio if audio else await synthesize(speech, text)))
+
+    metrics.observe("prewarm_build_seconds", time.monotonic() - started)
+    logger.info(f"🔥 Session {session_id[:8]} warm in {time.monotonic() - started:.2f}s")
+    return brain, rendered
+
+
+async def claim_prewarmed(session_id: str, wait: Optional[float] = None):
+    """
+    Take the warmed (brain, intro_segments) for a session, or None.
+
+    If warming is still in progress we wait for it (bounded by `wait`),
+    since finishing it is never slower than starting from scratch.
+    """
+    _purge_expired()
+    entry = _warm.pop(str(session_id), None)
+    metrics.set_gauge("prewarm_sessions", len(_warm))
+    if entry is None:
+        metrics.incr("prewarm_misses_total")
+        return None
+
+    try:
+        result = await asyncio.wait_for(
+            asyncio.shield(entry.task), wait if wait is not None else settings.PREWARM_CLAIM_WAIT
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Pre-warmed session {str(session_id)[:8]} unusable: {e}")
+        entry.task.cancel()
+        metrics.incr("prewarm_misses_total")
+        return None
+
+    metrics.incr("prewarm_hits_total")
+    return result
+
+
+def _purge_expired():
+    now = time.monotonic()
+    for session_id in [sid for sid, entry in _warm.items() if entry.expires_at < now]:
+        _warm.pop(session_id).task.cancel()
+        metrics.incr("prewarm_expired_total")
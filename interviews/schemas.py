@@ -0,0 +1,84 @@
+"""
+Gemini Response Schemas
+Structured-output schemas shared by the live interviewer and the grading worker
+"""
+
+
+from functools import lru_cache
+
+from google.genai import types
+
+
+# Fields the live path needs to pick the next question
+DECISION_PROPERTIES = {
+    "understanding_score": {"type": "INTEGER"},
+    "explainability_score": {"type": "INTEGER"},
+    "topic": {"type": "STRING"},
+    "is_cheating": {"type": "BOOLEAN"},
+    "is_off_topic": {"type": "BOOLEAN"},
+    "needs_clarification": {"type": "BOOLEAN"},
+    "did_pivot": {"type": "BOOLEAN"},
+    "next_question": {"type": "STRING"},
+}
+
+# Detailed grading that only feeds PerAnswerMetric
+GRADING_PROPERTIES = {
+    "evidence_extracted": {"type": "STRING"},
+    "critique": {"type": "STRING"},
+    "ideal_answer": {"type": "STRING"},
+    "technical_concepts_missed": {
+        "type": "ARRAY",
+        "items": {"type": "STRING"}
+    },
+    "bias_flag": {"type": "BOOLEAN"},
+}
+
+# One grading call covering several answers (background grading worker)
+BATCH_GRADING_PROPERTIES = {
+    "grades": {
+        "type": "ARRAY",
+        "items": {
+            "type": "OBJECT",
+            "properties": {"answer_index": {"type": "INTEGER"}, **GRADING_PROPERTIES},
+            "required": ["answer_index"]
+        }
+    }
+}
+
+# Pre-generated intros / opening questions for a job (opener bank)
+OPENER_PROPERTIES = {
+    "intros": {"type": "ARRAY", "items": {"type": "STRING"}},
+    "opening_questions": {"type": "ARRAY", "items": {"type": "STRING"}},
+}
+
+
+def build_response_config(properties, temperature=None):
+    # propertyOrdering keeps fields in declaration order, so the short decision
+    # fields and next_question stream ahead of the long grading text.
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        temperature=temperature,
+        response_schema={
+            "type": "OBJECT",
+            "properties": properties,
+            "propertyOrdering": list(properties),
+        }
+    )
+
+
+SCHEMAS = {
+    "decision": DECISION_PROPERTIES,
+    "grading": GRADING_PROPERTIES,
+    "full": {**DECISION_PROPERTIES, **GRADING_PROPERTIES},
+    "batch_grading": BATCH_GRADING_PROPERTIES,
+    "openers": OPENER_PROPERTIES,
+}
+
+
+@lru_cache(maxsize=64)
+def response_config(schema, temperature=None):
+    """
+    Compiled GenerateContentConfig for a named schema, built once and reused
+    across turns. Treat the returned object as read-only.
+    """
+    return build_response_config(SCHEMAS[schema], temperature)
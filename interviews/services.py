@@ -1,17 +1,43 @@
-from google import genai
 from google.genai import types
 from django.conf import settings
 from .models import InterviewSession, PerAnswerMetric, EvidenceSnippet
+from .json_stream import JSONFieldExtractor
+from .schemas import response_config
+from .openers import build_opener_bank, load_opener_bank, personalize_greeting
+from .grading import GradingJob, get_grading_queue
+from .interview_state import InterviewState, estimate_tokens, CHARS_PER_TOKEN
+from .speech_features import SpeechFeatures, extract_features
+from .metrics import metrics
+from . import llm
+from .utils import spawn_background
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 import asyncio
 import logging
 import json
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class Evaluation:
+    """One LLM evaluation of an answer, not yet applied to the interview state."""
+    data: Dict[str, Any]
+    remainder: Optional[asyncio.Task]  # still-streaming rest of the evaluation, if any
+    version: int  # InterviewerBrain.state_version the prompt was built from
+    two_tier: bool
+
+    def discard(self):
+        if self.remainder is not None:
+            self.remainder.cancel()
+
+
 class InterviewerBrain:
-    def __init__(self, session_id):
-        self.session = InterviewSession.objects.select_related('job').get(id=session_id)
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    def __init__(self, session_id, client=None, session=None):
+        # `client` / `session` let the consumer load them concurrently beforehand
+        self.session = session or InterviewSession.objects.select_related('job').get(id=session_id)
+        self.client = client or llm.create_client()
         self.model_id = "gemini-2.5-flash"
         
         rubric = self.session.job.rubric_template
@@ -25,11 +51,25 @@ class InterviewerBrain:
         self.last_question_asked = None
         self.current_topic_drill_depth = 0
 
+        # Compact state rendered into the prompt instead of raw transcripts.
+        # Seeded from the DB only when resuming; afterwards kept in sync in get_answer.
+        self.state = InterviewState(
+            self.languages + self.core_skills, max_digests=settings.BRAIN_HISTORY_SIZE
+        )
+        self.last_prompt_tokens = 0
+        self.state_version = 0  # bumped whenever an answer is committed to the state
+        self.speech_history = deque(maxlen=settings.SPEECH_HISTORY_SIZE)  # SpeechFeatures of earlier answers
+        self._load_history()
+
+        # Pre-generated intro / opening question for this job (None if the bank is missing or stale)
+        self.intro_opener, self.opening_opener = load_opener_bank(self.session.job)
+        self.prerendered_audio = {}
+
         config = types.GenerateContentConfig(
             system_instruction=self.get_instructions(),
             temperature=0.7,
         )
-        self.chat = self.client.chats.create(model=self.model_id, config=config)
+        self.chat = self.client.aio.chats.create(model=self.model_id, config=config)
 
     def get_instructions(self):
         skills_str = ", ".join(self.core_skills)
@@ -57,66 +97,54 @@ class InterviewerBrain:
             f"Briefly mention we'll be discussing {languages_str} and related technical skills. "
             "End by asking if they are ready to begin. Keep it natural and under 3 short sentences."
         )
-        response = await asyncio.to_thread(self.chat.send_message, prompt)
-        
-        self.session.current_stage = 'technical'
-        await asyncio.to_thread(self.session.save)
+        response = await llm.send_chat_message(self.chat, self.model_id, prompt)
         return response.text
 
-    def _get_history_context(self):
-        metrics = list(PerAnswerMetric.objects.filter(session=self.session).order_by('-timestamp')[:3])
-        metrics.reverse()
-        
-        context = ""
-        for i, metric in enumerate(metrics):
-            context += f"Previous Question: {metric.question_asked}\n"
-            context += f"Candidate Answered: {metric.candidate_answer}\n"
-            context += f"Score: {metric.confidence_score}/10\n\n"
-        return context
-
-    async def get_answer(self, user_text, pause_duration=0):
-        try:
-            # Increment turn count first
-            self.turn_count += 1
+    async def mark_started(self):
+        """The intro is being spoken to the candidate: the session is now in the technical stage."""
+        self.session.current_stage = 'technical'
+        await asyncio.to_thread(self.session.save, update_fields=['current_stage'])
 
-            # Check if interview should end
-            if self.turn_count >= self.max_turns:
-                logger.info(f"🏁 INTERVIEW COMPLETE | Total Turns: {self.turn_count}")
-                return "FINISH_INTERVIEW: It's been great chatting with you! We've covered a wide range of topics. I'll pass my notes over to the team, and they'll be in touch. Do you have any final questions?"
+    async def get_intro_segments(self, allow_live=True):
+        """
+        Intro as [(text, audio_or_None), ...] segments. Uses the job's opener bank
+        (personal greeting + pre-rendered intro) and falls back to a live LLM intro,
+        or returns None without side effects if allow_live is False (pre-warming).
+        """
+        if self.intro_opener is None:
+            if not allow_live:
+                return None
+            logger.info("🐢 No opener bank for this job yet, generating intro live")
+            spawn_background(build_opener_bank(self.session.job_id))
+            return [(await self.generate_intro(), None)]
 
-            # Get conversation history
-            history_context = await asyncio.to_thread(self._get_history_context)
-            
-            # 🚀 SINGLE-PASS BRAIN: LLM decides everything in ONE call
-            skills_str = ", ".join(self.core_skills)
-            languages_str = ", ".join(self.languages)
-            
-            prompt = (
-                f"Candidate: {self.session.candidate_name}\n"
-                f"Languages/Technologies: {languages_str}\n"
-                f"Core Skills to Cover: {skills_str}\n"
-                f"Current Topic Drill Depth: {self.current_topic_drill_depth}\n"
-                f"Time taken before candidate started speaking: {pause_duration}s\n\n"
-                f"--- PREVIOUS CONVERSATION HISTORY ---\n{history_context}\n"
-                f"--- CURRENT EXCHANGE ---\n"
-                f"Last Question: {self.last_question_asked or 'This is the first question'}\n"
-                f"Candidate Answer: {user_text}\n\n"
-                "YOUR TASK: Evaluate the answer AND generate the next question in ONE RESPONSE.\n\n"
-                "STEP 1: GRADE THE ANSWER (1-10 for understanding, 1-10 for explainability)\n"
-                "- Score 8-10 (EXCELLENT): Specific architectural decisions, real-world tools, clear problem-solving.\n"
-                "- Score 5-7 (AVERAGE): Technically correct but shallow.\n"
-                "- Score 1-4 (POOR): Incorrect, dodges question, or zero technical knowledge.\n"
-                "- is_off_topic: TRUE if answer is nonsense or completely unrelated.\n"
-                "- is_cheating: TRUE if pause_duration > 8s AND answer sounds robotic/textbook, OR if massive unnatural spike in fluency compared to history.\n"
-                "- needs_clarification: TRUE ONLY if they explicitly ask you to repeat/clarify.\n\n"
-                "STEP 2: DECIDE NEXT QUESTION BASED ON SCORE\n"
-                "- If needs_clarification: Rephrase the previous question simply. Set did_pivot=false.\n"
-                "- If is_cheating: Call them out gently. Ask for explanation in their own words. Set did_pivot=false.\n"
-                "- If is_off_topic: Be politely stern, ask them to stay focused. Pivot to DIFFERENT skill. Set did_pivot=true.\n"
-                "- If Score < 4: Say 'No worries!' and PIVOT to a COMPLETELY DIFFERENT skill. Set did_pivot=true.\n"
-                "- If Score >= 8 AND drill_depth < 2: Ask specific follow-up to go deeper (drill down). Set did_pivot=false.\n"
-                "- If Score >= 8 AND drill_depth >= 2: Acknowledge briefly, pivot to DIFFERENT skill. Set did_pivot=true.\n"
-                "- If Score 5-7: Acknowledge answer, move to next skill. Set did_pivot=true.\n\n"
+        logger.info("⚡ Using pre-generated intro")
+        intro = self.intro_opener
+        self.intro_opener = None
+        return [
+            (personalize_greeting(self.session.candidate_name), None),
+            (intro.text, bytes(intro.audio) if intro.audio else None),
+        ]
+
+    def _load_history(self):
+        metrics = PerAnswerMetric.objects.filter(session=self.session).order_by('timestamp')
+        count = 0
+        for metric in metrics:
+            self.state.record(
+                metric.question_asked, metric.candidate_answer, metric.confidence_score or 0,
+                metric.explainability_score, metric.topic,
+            )
+            if metric.speech_features:
+                self.speech_history.append(SpeechFeatures.from_dict(metric.speech_features))
+            count += 1
+        if count:
+            logger.info(f"♻️ Resumed session with {count} previous exchanges")
+
+    def _static_instructions(self, include_grading=True):
+        """Rubric + grading instructions: identical for every turn of every session on this job."""
+        if include_grading:
+            task = "YOUR TASK: Evaluate the answer AND generate the next question in ONE RESPONSE.\n\n"
+            response_format = (
                 "STEP 3: FORMAT YOUR RESPONSE\n"
                 "- next_question: Maximum 2 sentences. Sound casual and human. End with ONE clear question.\n"
                 "- Extract exact quote as evidence_extracted.\n"
@@ -125,87 +153,405 @@ class InterviewerBrain:
                 "- List specific technical_concepts_missed (e.g., 'Indexing', 'N+1 queries').\n\n"
                 "Return comprehensive JSON with ALL fields."
             )
+        else:
+            task = "YOUR TASK: Score the answer and generate the next question. Detailed grading happens separately.\n\n"
+            response_format = (
+                "STEP 3: FORMAT YOUR RESPONSE\n"
+                "- next_question: Maximum 2 sentences. Sound casual and human. End with ONE clear question.\n\n"
+                "Return JSON with the scores, flags and next_question only."
+            )
+
+        return (
+            f"You are evaluating candidates for a {self.level} {self.session.job.title} role.\n"
+            f"Languages/Technologies: {', '.join(self.languages)}\n"
+            f"Core Skills to Cover: {', '.join(self.core_skills)}\n"
+            f"Evaluation Focus: {', '.join(self.focus)}\n\n"
+            f"{task}"
+            "STEP 1: GRADE THE ANSWER (1-10 for understanding, 1-10 for explainability)\n"
+            "- topic: The ONE skill or language from the skill coverage list that this answer addressed.\n"
+            "- Score 8-10 (EXCELLENT): Specific architectural decisions, real-world tools, clear problem-solving.\n"
+            "- Score 5-7 (AVERAGE): Technically correct but shallow.\n"
+            "- Score 1-4 (POOR): Incorrect, dodges question, or zero technical knowledge.\n"
+            "- is_off_topic: TRUE if answer is nonsense or completely unrelated.\n"
+            "- is_cheating: TRUE only if the Speech line lists flags AND the answer reads like recited/textbook text rather than their own words.\n"
+            "- needs_clarification: TRUE ONLY if they explicitly ask you to repeat/clarify.\n\n"
+            "STEP 2: DECIDE NEXT QUESTION BASED ON SCORE\n"
+            "- If needs_clarification: Rephrase the previous question simply. Set did_pivot=false.\n"
+            "- If is_cheating: Call them out gently. Ask for explanation in their own words. Set did_pivot=false.\n"
+            "- If is_off_topic: Be politely stern, ask them to stay focused. Pivot to DIFFERENT skill. Set did_pivot=true.\n"
+            "- If Score < 4: Say 'No worries!' and PIVOT to a COMPLETELY DIFFERENT skill. Set did_pivot=true.\n"
+            "- Prefer skills with 0 questions in the coverage list when pivoting.\n"
+            "- If Score >= 8 AND drill_depth < 2: Ask specific follow-up to go deeper (drill down). Set did_pivot=false.\n"
+            "- If Score >= 8 AND drill_depth >= 2: Acknowledge briefly, pivot to DIFFERENT skill. Set did_pivot=true.\n"
+            "- If Score 5-7: Acknowledge answer, move to next skill. Set did_pivot=true.\n\n"
+            f"{response_format}"
+        )
+
+    def speech_features(self, transcript, pause_duration):
+        """Local speech-behaviour features for an answer, compared against this candidate's earlier answers."""
+        return extract_features(
+            transcript, pause_duration, self.speech_history,
+            latency_flag=settings.SPEECH_LATENCY_FLAG, spike_flag=settings.SPEECH_FLUENCY_SPIKE,
+        )
+
+    def _build_evaluation_prompt(self, user_text, pause_duration, include_grading=True, speech=None):
+        """Per-turn context (candidate, speech, state, exchange) followed by the static instructions."""
+        instructions = self._static_instructions(include_grading)
+        if speech is not None:
+            speech_line = f"Speech: {speech.render()}"
+        else:
+            speech_line = f"Speech: latency {pause_duration}s (no word timings) | flags: none"
 
-            config = types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema={
-                    "type": "OBJECT",
-                    "properties": {
-                        "understanding_score": {"type": "INTEGER"},
-                        "explainability_score": {"type": "INTEGER"},
-                        "is_cheating": {"type": "BOOLEAN"},
-                        "is_off_topic": {"type": "BOOLEAN"},
-                        "needs_clarification": {"type": "BOOLEAN"},
-                        "did_pivot": {"type": "BOOLEAN"},
-                        "next_question": {"type": "STRING"},
-                        "evidence_extracted": {"type": "STRING"},
-                        "critique": {"type": "STRING"},
-                        "ideal_answer": {"type": "STRING"},
-                        "technical_concepts_missed": {
-                            "type": "ARRAY",
-                            "items": {"type": "STRING"}
-                        },
-                        "bias_flag": {"type": "BOOLEAN"}
-                    }
-                }
+        def assemble(state_text, answer):
+            return (
+                f"Candidate: {self.session.candidate_name}\n"
+                f"{speech_line}\n\n"
+                f"--- INTERVIEW STATE ---\n{state_text}\n\n"
+                f"--- CURRENT EXCHANGE ---\n"
+                f"Last Question: {self.last_question_asked or 'This is the first question'}\n"
+                f"Candidate Answer: {answer}\n\n"
             )
 
-            # 🚀 ONE CALL TO GEMINI
-            response = await asyncio.to_thread(
-                self.client.models.generate_content, 
-                model=self.model_id, 
-                contents=prompt, 
-                config=config
+        # ✂️ Fit the prompt into the token budget: drop old digests first, then trim the answer
+        budget = settings.PROMPT_TOKEN_BUDGET
+        instruction_tokens = estimate_tokens(instructions)
+        fixed_tokens = estimate_tokens(assemble("", user_text)) + instruction_tokens
+        if fixed_tokens > budget:
+            overflow_chars = (fixed_tokens - budget) * CHARS_PER_TOKEN
+            user_text = user_text[:max(200, len(user_text) - overflow_chars)] + " [truncated]"
+            fixed_tokens = estimate_tokens(assemble("", user_text)) + instruction_tokens
+        state_text = self.state.render_within_budget(self.current_topic_drill_depth, fixed_tokens, budget)
+
+        prompt = assemble(state_text, user_text) + instructions
+        self.last_prompt_tokens = estimate_tokens(prompt)
+        return prompt
+
+    def can_speculate(self):
+        """True if the next get_answer() would call the LLM (not the closing line or a banked opener)."""
+        if self.turn_count + 1 >= self.max_turns:
+            return False
+        return not (self.last_question_asked is None and self.opening_opener is not None)
+
+    async def get_answer(self, user_text, pause_duration=0, speculation=None, segments=None, speech=None):
+        """
+        Evaluate the answer and return the next question. `speculation` is an
+        optional task running evaluate() on the same text, started before the
+        turn ended; it is used if the interview state hasn't moved since.
+        `segments` (transcript segments) and `speech` (SpeechFeatures) are saved
+        with the answer's PerAnswerMetric; `speech` also goes into the prompt.
+        """
+        try:
+            # Increment turn count first
+            self.turn_count += 1
+
+            # Check if interview should end
+            if self.turn_count >= self.max_turns:
+                self._discard_speculation(speculation)
+                logger.info(f"🏁 INTERVIEW COMPLETE | Total Turns: {self.turn_count}")
+                return "FINISH_INTERVIEW: It's been great chatting with you! We've covered a wide range of topics. I'll pass my notes over to the team, and they'll be in touch. Do you have any final questions?"
+
+            # ⚡ First real question comes straight from the opener bank
+            if self.last_question_asked is None and self.opening_opener is not None:
+                self._discard_speculation(speculation)
+                opener = self.opening_opener
+                self.opening_opener = None
+                if opener.audio:
+                    self.prerendered_audio[opener.text] = bytes(opener.audio)
+                self.last_question_asked = opener.text
+                self.state_version += 1
+                logger.info("⚡ Using pre-generated opening question")
+                return opener.text
+
+            evaluation = await self._claim_speculation(speculation)
+            if evaluation is None:
+                evaluation = await self.evaluate(user_text, pause_duration, speech)
+            answer_fields = {
+                "transcript_segments": segments or [],
+                "speech_features": speech.to_dict() if speech else {},
+            }
+            return self._commit_evaluation(evaluation, user_text, pause_duration, answer_fields, speech)
+
+        except asyncio.CancelledError:
+            # Barge-in while thinking: nothing was committed and the answer will be
+            # resubmitted with the rest of the candidate's speech, so it must not count twice
+            self.turn_count -= 1
+            raise
+        except Exception as e:
+            logger.error(f"💥 Brain Pipeline Error: {e}", exc_info=True)
+            return "That's interesting. Could you tell me more about your experience with that?"
+
+    async def evaluate(self, user_text, pause_duration=0, speech=None):
+        """
+        Run the evaluation LLM call for an answer without touching interview
+        state, so it can be started speculatively and cancelled at any point.
+        """
+        version = self.state_version
+        two_tier = settings.BRAIN_MODE == "two_tier"
+
+        if two_tier:
+            # ⚡ LIVE TIER: scores + pivot decision + next_question only
+            prompt = self._build_evaluation_prompt(
+                user_text, pause_duration, include_grading=False, speech=speech
             )
-            data = json.loads(response.text)
-
-            # Extract results
-            score = data.get('understanding_score', 0)
-            explainability = data.get('explainability_score', 0)
-            is_cheating = data.get('is_cheating', False)
-            is_off_topic = data.get('is_off_topic', False)
-            needs_clarification = data.get('needs_clarification', False)
-            did_pivot = data.get('did_pivot', False)
-            next_question = data.get('next_question', '')
-
-            # 📊 LOG EVALUATION RESULTS
-            logger.info(f"📊 GEMINI EVALUATION | Understanding: {score}/10 | Explainability: {explainability}/10 | Cheating: {is_cheating} | Off-Topic: {is_off_topic} | Needs Clarification: {needs_clarification} | Pivoted: {did_pivot}")
-            if data.get('evidence_extracted'):
-                logger.info(f"💬 Evidence Quote: \"{data.get('evidence_extracted')}\"")
-
-            # Update local state based on LLM's decision
-            if needs_clarification:
-                self.turn_count -= 1  # Don't count clarification requests
-            
-            if did_pivot:
-                self.current_topic_drill_depth = 0
-                if score < 4:
-                    logger.info(f"⚠️ WEAK/NO ANSWER | Score: {score}/10 | LLM pivoted to new skill")
-                elif is_off_topic:
-                    logger.warning(f"🚫 CANDIDATE WENT OFF-TOPIC | Score: {score}/10 | LLM pivoted")
-            elif score >= 8:
-                self.current_topic_drill_depth += 1
-                logger.info(f"✅ STRONG ANSWER | Score: {score}/10 | Drill Depth: {self.current_topic_drill_depth}")
+            config = response_config("decision", settings.LIVE_TEMPERATURE)
+            model_id = settings.LIVE_MODEL_ID
+        else:
+            # 🚀 SINGLE-PASS BRAIN: LLM decides everything in ONE call
+            prompt = self._build_evaluation_prompt(user_text, pause_duration, speech=speech)
+            config = response_config("full")
+            model_id = self.model_id
+
+        logger.info(f"🧾 Prompt ~{self.last_prompt_tokens} tokens (budget {settings.PROMPT_TOKEN_BUDGET})")
+
+        async def attempt(model):
+            if settings.GEMINI_STREAMING:
+                data, remainder = await self._stream_until_next_question(model, prompt, config)
             else:
-                logger.info(f"✅ VALID ANSWER | Score: {score}/10")
+                # 🚀 ONE CALL TO GEMINI
+                response = await llm.generate_content(
+                    self.client,
+                    model=model, 
+                    contents=prompt, 
+                    config=config
+                )
+                data, remainder = json.loads(response.text), None
+            if not data.get('next_question'):
+                if remainder is not None:
+                    remainder.cancel()
+                raise ValueError("LLM response is missing next_question")
+            return data, remainder
+
+        def discard(result):
+            # A losing attempt that also reached next_question: stop its stream
+            if result[1] is not None:
+                result[1].cancel()
+
+        # ⏱️ Latency budget: hedge to the secondary model if the primary is slow or failing
+        data, remainder = await llm.hedged(attempt, [model_id, settings.LLM_HEDGE_MODEL_ID], discard=discard)
+        return Evaluation(data=data, remainder=remainder, version=version, two_tier=two_tier)
+
+    async def _claim_speculation(self, speculation):
+        """Result of a speculative evaluate() if it is still valid, else None."""
+        if speculation is None:
+            return None
+        try:
+            evaluation = await speculation
+        except Exception as e:
+            logger.warning(f"⚠️ Speculative evaluation failed, evaluating again: {e}")
+            metrics.incr("speculations_wasted_total", reason="failed")
+            return None
+        if evaluation.version != self.state_version:
+            evaluation.discard()
+            metrics.incr("speculations_wasted_total", reason="stale")
+            return None
+        logger.info("🔮 Using speculative evaluation")
+        metrics.incr("speculations_used_total")
+        return evaluation
 
-            if is_cheating:
-                logger.warning(f"🚨 CHEATING SUSPECTED | Score: {score}/10 | Pause Duration: {pause_duration}s | Answer: \"{user_text[:100]}...\"")
+    def _discard_speculation(self, speculation):
+        if speculation is None:
+            return
+        if not speculation.done():
+            speculation.cancel()
+        elif not speculation.cancelled() and speculation.exception() is None:
+            speculation.result().discard()
+        metrics.incr("speculations_wasted_total", reason="unused")
 
-            if self.last_question_asked:  
-                asyncio.create_task(
-                    self._save_background_metrics(self.last_question_asked, user_text, data, score)
+    def _commit_evaluation(self, evaluation, user_text, pause_duration, answer_fields, speech=None):
+        """Apply an evaluation to the interview state, queue the grading work and return next_question."""
+        data, remainder = evaluation.data, evaluation.remainder
+        question = self.last_question_asked
+        next_question = self._apply_evaluation(data, user_text, pause_duration)
+
+        if speech is not None:
+            self.speech_history.append(speech)
+            if data.get('is_cheating') and speech.flags:
+                answer_fields["cheating_reason"] = ", ".join(speech.flags)
+
+        if question:
+            self.state.record(
+                question, user_text,
+                data.get('understanding_score', 0),
+                data.get('explainability_score', 0),
+                data.get('topic'),
+            )
+            # Persisted so a resumed session rebuilds the same coverage and averages
+            answer_fields["explainability_score"] = data.get('explainability_score', 0)
+            answer_fields["topic"] = (data.get('topic') or '')[:100]
+            if evaluation.two_tier:
+                spawn_background(
+                    self._grade_in_background(question, user_text, data, remainder, answer_fields)
+                )
+            elif remainder is not None:
+                spawn_background(
+                    self._finish_streamed_evaluation(remainder, question, user_text, data, answer_fields)
+                )
+            else:
+                spawn_background(
+                    self._save_background_metrics(
+                        question, user_text, data, data.get('understanding_score', 0), answer_fields
+                    )
                 )
+        else:
+            evaluation.discard()
+
+        self.last_question_asked = next_question
+        self.state_version += 1
+
+        return next_question
+
+    def _apply_evaluation(self, data, user_text, pause_duration):
+        """Update drill/turn state from the LLM's decision fields and return next_question."""
+        # Extract results
+        score = data.get('understanding_score', 0)
+        explainability = data.get('explainability_score', 0)
+        is_cheating = data.get('is_cheating', False)
+        is_off_topic = data.get('is_off_topic', False)
+        needs_clarification = data.get('needs_clarification', False)
+        did_pivot = data.get('did_pivot', False)
+        next_question = data.get('next_question', '')
+
+        # 📊 LOG EVALUATION RESULTS
+        logger.info(f"📊 GEMINI EVALUATION | Understanding: {score}/10 | Explainability: {explainability}/10 | Cheating: {is_cheating} | Off-Topic: {is_off_topic} | Needs Clarification: {needs_clarification} | Pivoted: {did_pivot}")
+        if data.get('evidence_extracted'):
+            logger.info(f"💬 Evidence Quote: \"{data.get('evidence_extracted')}\"")
+
+        # Update local state based on LLM's decision
+        if needs_clarification:
+            self.turn_count -= 1  # Don't count clarification requests
+        
+        if did_pivot:
+            self.current_topic_drill_depth = 0
+            if score < 4:
+                logger.info(f"⚠️ WEAK/NO ANSWER | Score: {score}/10 | LLM pivoted to new skill")
+            elif is_off_topic:
+                logger.warning(f"🚫 CANDIDATE WENT OFF-TOPIC | Score: {score}/10 | LLM pivoted")
+        elif score >= 8:
+            self.current_topic_drill_depth += 1
+            logger.info(f"✅ STRONG ANSWER | Score: {score}/10 | Drill Depth: {self.current_topic_drill_depth}")
+        else:
+            logger.info(f"✅ VALID ANSWER | Score: {score}/10")
 
-            self.last_question_asked = next_question
+        if is_cheating:
+            logger.warning(f"🚨 CHEATING SUSPECTED | Score: {score}/10 | Pause Duration: {pause_duration}s | Answer: \"{user_text[:100]}...\"")
 
-            return next_question
+        return next_question
 
+    async def _stream_until_next_question(self, model_id, prompt, config):
+        """
+        Stream the evaluation and return as soon as next_question has closed.
+
+        Returns (fields_so_far, remainder_task). The remainder task keeps
+        draining the stream and resolves to the full evaluation dict.
+        """
+        queue = asyncio.Queue()
+        extractor = JSONFieldExtractor()
+
+        async def pump():
+            try:
+                async for chunk in llm.stream_content(
+                    self.client, model=model_id, contents=prompt, config=config
+                ):
+                    if chunk.text: queue.put_nowait(chunk.text)
+            finally:
+                queue.put_nowait(None)
+
+        pump_task = asyncio.create_task(pump())
+        parts = []
+
+        async def drain():
+            try:
+                while (piece := await queue.get()) is not None:
+                    parts.append(piece)
+                    extractor.feed(piece)
+                await pump_task
+            except BaseException:
+                pump_task.cancel()
+                raise
+            return json.loads("".join(parts))
+
+        try:
+            while 'next_question' not in extractor.values:
+                piece = await queue.get()
+                if piece is None:
+                    # Stream ended without the field we were waiting for
+                    await pump_task
+                    return json.loads("".join(parts)), None
+                parts.append(piece)
+                extractor.feed(piece)
+        except BaseException:
+            # Cancelled (lost a hedge race) or failed: stop the stream too
+            pump_task.cancel()
+            raise
+
+        logger.info("⚡ next_question received, finishing evaluation in background")
+        return dict(extractor.values), asyncio.create_task(drain())
+
+    async def _finish_streamed_evaluation(self, remainder, question, answer, partial, answer_fields=None):
+        try:
+            data = await remainder
         except Exception as e:
-            logger.error(f"💥 Brain Pipeline Error: {e}", exc_info=True)
-            return "That's interesting. Could you tell me more about your experience with that?"
+            logger.error(f"❌ Streamed evaluation failed after next_question: {e}")
+            data = partial
+        await self._save_background_metrics(question, answer, data, data.get('understanding_score', 0), answer_fields)
+
+    def _grading_role_context(self):
+        return (
+            f"Role: {self.level} {self.session.job.title}\n"
+            f"Languages/Technologies: {', '.join(self.languages)}\n"
+            f"Core Skills: {', '.join(self.core_skills)}\n"
+        )
+
+    def _build_grading_prompt(self, question, answer, decision):
+        return (
+            f"{self._grading_role_context()}\n"
+            f"Question: {question}\n"
+            f"Candidate Answer: {answer}\n"
+            f"Live scores: understanding {decision.get('understanding_score', 0)}/10, "
+            f"explainability {decision.get('explainability_score', 0)}/10\n\n"
+            "YOUR TASK: Write the detailed grading notes for this answer.\n"
+            "- evidence_extracted: Exact quote from the answer that best supports the score.\n"
+            "- critique: Explain what was missing or wrong.\n"
+            "- ideal_answer: A 10/10 response example.\n"
+            "- technical_concepts_missed: Specific concepts (e.g., 'Indexing', 'N+1 queries').\n"
+            "- bias_flag: TRUE if the live scores look unfair given what the candidate actually said.\n\n"
+            "Return JSON with ALL fields."
+        )
+
+    async def _grade_in_background(self, question, answer, decision, remainder=None, answer_fields=None):
+        """Deferred grading tier: fills in the PerAnswerMetric detail off the critical path."""
+        if remainder is not None:
+            try:
+                decision = {**decision, **await remainder}
+            except Exception as e:
+                logger.error(f"❌ Streamed decision failed after next_question: {e}")
+
+        if settings.GRADING_BATCHED:
+            get_grading_queue().enqueue(GradingJob(
+                session=self.session,
+                question=question,
+                answer=answer,
+                decision=decision,
+                role_context=self._grading_role_context(),
+                answer_fields=answer_fields or {},
+            ))
+            return
+
+        data = dict(decision)
+        try:
+            response = await llm.generate_content(
+                self.client,
+                model=settings.GRADING_MODEL_ID,
+                contents=self._build_grading_prompt(question, answer, decision),
+                config=response_config("grading", settings.GRADING_TEMPERATURE)
+            )
+            data.update(json.loads(response.text))
+        except Exception as e:
+            logger.error(f"❌ Deferred grading failed: {e}")
+
+        await self._save_background_metrics(question, answer, data, data.get('understanding_score', 0), answer_fields)
 
-    async def _save_background_metrics(self, question, answer, eval_data, score):
+    async def _save_background_metrics(self, question, answer, eval_data, score, answer_fields=None):
         try:
             # 🚀 FORCE empty list if Gemini sends null
             tech_missed = eval_data.get('technical_concepts_missed')
@@ -223,7 +569,8 @@ class InterviewerBrain:
                 ideal_answer=eval_data.get('ideal_answer', '') or '',
                 technical_concepts_missed=tech_missed, # 🚀 FIXED
                 is_cheating_suspected=eval_data.get('is_cheating', False) or False,
-                bias_flag=eval_data.get('bias_flag', False) or False
+                bias_flag=eval_data.get('bias_flag', False) or False,
+                **(answer_fields or {})
             )
             logger.info("✅ Background metrics saved to DB!")
         except Exception as e:
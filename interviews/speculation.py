@@ -0,0 +1,90 @@
+"""
+Speculative Answer Evaluation
+Starts InterviewerBrain.evaluate() once the candidate's finalized transcript
+has been stable for a short while, so the LLM call overlaps the end-of-turn
+silence. The result is only used if the turn ends on exactly that text.
+"""
+
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+class Speculator:
+    """Per-connection speculation state. All methods run on the event loop."""
+
+    def __init__(self, brain, stable_after: float = 0.3):
+        self.brain = brain
+        self.stable_after = stable_after
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.task: Optional[asyncio.Task] = None
+        self.text: Optional[str] = None
+        self.started_at = 0.0
+
+    def on_speech(self):
+        """New words are being recognized: whatever we speculated on is out of date."""
+        self._disarm()
+        if self.task is not None:
+            self._cancel("superseded")
+
+    def on_final(self, transcript, pause_duration: float):
+        """The finalized transcript changed; speculate on it once it stays put."""
+        self._disarm()
+        if self.task is not None and _normalize(transcript.text) != self.text:
+            self._cancel("superseded")
+        if self.task is None and transcript.text.strip():
+            self.timer = asyncio.get_running_loop().call_later(
+                self.stable_after, self._start, transcript, pause_duration
+            )
+
+    def take(self, text: str) -> Optional[asyncio.Task]:
+        """The turn ended on `text`: hand over the matching speculation, if any."""
+        self._disarm()
+        if self.task is None:
+            return None
+        if _normalize(text) != self.text:
+            self._cancel("mismatch")
+            return None
+        task, self.task = self.task, None
+        metrics.observe("speculation_head_start_seconds", time.monotonic() - self.started_at)
+        return task
+
+    def cancel(self):
+        self._disarm()
+        if self.task is not None:
+            self._cancel("cancelled")
+
+    def _start(self, transcript, pause_duration: float):
+        self.timer = None
+        if not self.brain.can_speculate():
+            return
+        text = transcript.text
+        speech = self.brain.speech_features(transcript, pause_duration)
+        self.text = _normalize(text)
+        self.started_at = time.monotonic()
+        self.task = asyncio.create_task(self.brain.evaluate(text, pause_duration, speech))
+        metrics.incr("speculations_started_total")
+        logger.info(f"🔮 Speculating on stable transcript ({len(self.text.split())} words)")
+
+    def _disarm(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def _cancel(self, reason: str):
+        task, self.task = self.task, None
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is None:
+            task.result().discard()
+        metrics.incr("speculations_wasted_total", reason=reason)
@@ -0,0 +1,106 @@
+"""
+Local Speech-Behaviour Features
+Computes speaking rate, pause distribution, filler rate and fluency change
+from an answer's word timings (NumPy, no LLM involved). The deterministic
+flags replace the prompt's guesswork about whether an answer "sounds robotic".
+"""
+
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+FILLER_WORDS = np.array(["um", "uh", "uhm", "umm", "erm", "er", "ah", "hmm", "mm"])
+LONG_PAUSE = 1.0  # seconds between words
+MIN_HISTORY = 2  # earlier answers needed before fluency_shift means anything
+MIN_RATE_STD = 10.0  # wpm; keeps the z-score sane when earlier answers were very uniform
+
+
+class SpeechFeatures:
+    """Compact per-answer feature vector."""
+    __slots__ = ("words", "duration", "latency", "wpm", "pause_mean", "pause_p90", "pause_max",
+                 "long_pauses", "filler_rate", "confidence", "fluency_shift", "flags")
+
+    FIELDS = __slots__
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+        self.flags = list(self.flags or [])
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SpeechFeatures":
+        return cls(**{name: data.get(name) for name in cls.FIELDS})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def render(self) -> str:
+        """One prompt line."""
+        shift = f"{self.fluency_shift:+.1f}σ" if self.fluency_shift is not None else "n/a"
+        return (
+            f"latency {self.latency:.1f}s | {self.wpm:.0f} wpm | "
+            f"pauses mean {self.pause_mean:.2f}s p90 {self.pause_p90:.2f}s "
+            f"max {self.pause_max:.2f}s ({self.long_pauses} >{LONG_PAUSE:.0f}s) | "
+            f"fillers {self.filler_rate:.1f}/100w | conf {self.confidence:.2f} | "
+            f"fluency vs earlier answers {shift} | flags: {', '.join(self.flags) or 'none'}"
+        )
+
+
+def _column(transcript, name: str) -> np.ndarray:
+    parts = [np.frombuffer(getattr(segment, name), dtype=np.float32) for segment in transcript.segments]
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.float32)
+
+
+def extract_features(transcript, latency: float, history: Sequence[SpeechFeatures] = (),
+                     latency_flag: float = 8.0, spike_flag: float = 2.0) -> Optional[SpeechFeatures]:
+    """
+    Features for one answer, or None if Deepgram gave us no word timings.
+
+    Flags:
+    - delayed_fluent_start: a long silence before answering, then unusually
+      smooth delivery (no fillers, no long pauses) -- the "read it off
+      something" pattern.
+    - fluency_spike: speaking rate far above this candidate's earlier answers.
+    """
+    starts = _column(transcript, "word_starts")
+    if starts.size == 0:
+        return None
+    ends = _column(transcript, "word_ends")
+    confidences = _column(transcript, "word_confidences")
+    words = np.char.strip(np.char.lower(np.array(
+        [word for segment in transcript.segments for word in segment.words]
+    )), ".,!?;:")
+
+    count = int(starts.size)
+    duration = max(float(ends[-1] - starts[0]), 1e-3)
+    gaps = np.clip(starts[1:] - ends[:-1], 0, None) if count > 1 else np.zeros(1, dtype=np.float32)
+    wpm = count / duration * 60
+    filler_rate = float(np.isin(words, FILLER_WORDS).sum()) * 100 / count
+
+    fluency_shift = None
+    if len(history) >= MIN_HISTORY:
+        rates = np.array([h.wpm for h in history], dtype=np.float64)
+        fluency_shift = float((wpm - rates.mean()) / max(rates.std(), MIN_RATE_STD))
+
+    features = SpeechFeatures(
+        words=count,
+        duration=round(duration, 2),
+        latency=round(float(latency or 0), 2),
+        wpm=round(wpm, 1),
+        pause_mean=round(float(gaps.mean()), 3),
+        pause_p90=round(float(np.percentile(gaps, 90)), 3),
+        pause_max=round(float(gaps.max()), 3),
+        long_pauses=int((gaps > LONG_PAUSE).sum()),
+        filler_rate=round(filler_rate, 2),
+        confidence=round(float(confidences.mean()), 3),
+        fluency_shift=round(fluency_shift, 2) if fluency_shift is not None else None,
+    )
+
+    flags: List[str] = []
+    if features.latency >= latency_flag and features.filler_rate == 0 and features.long_pauses == 0:
+        flags.append("delayed_fluent_start")
+    if fluency_shift is not None and fluency_shift >= spike_flag:
+        flags.append("fluency_spike")
+    features.flags = flags
+    return features
@@ -0,0 +1,253 @@
+"""
+Speech Providers (STT + TTS)
+The consumer talks to a SpeechProvider instead of the Deepgram SDK directly:
+live transcription with Deepgram-shaped result events, and blocking TTS chunk
+streams for the sentence pipeline. SPEECH_PROVIDER picks the backend; 'fake'
+is deterministic and in-process, for offline load tests and benchmarks.
+"""
+
+
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Iterator, List, Optional
+
+from django.conf import settings
+
+from .tts import TTS_ENCODING, TTS_VOICE
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechProvider:
+    """
+    Backend interface. Live handles returned by start_live() expose blocking
+    send(data) (audio bytes, or a JSON control string such as KeepAlive) and
+    finish(); both are called from worker threads.
+
+    on_transcript(result) gets objects shaped like Deepgram's LiveResultResponse
+    (channel.alternatives[0].transcript/words, is_final, speech_final, start,
+    duration) and, like on_utterance_end(), may be called from any thread.
+    """
+    name = "base"
+
+    async def start_live(self, on_transcript: Callable, on_utterance_end: Callable,
+                         endpointing_ms: int, utterance_end_ms: int):
+        raise NotImplementedError
+
+    def tts_chunks(self, text: str, chunk_bytes: int) -> Iterator[bytes]:
+        """Blocking generator of encoded audio for `text` (runs in a worker thread)."""
+        raise NotImplementedError
+
+
+class DeepgramProvider(SpeechProvider):
+    """Deepgram live (nova-2) transcription and Aura TTS."""
+    name = "deepgram"
+
+    def __init__(self):
+        from deepgram import DeepgramClient
+
+        # No SDK "keepalive" option: it starts a pinger thread per connection, and
+        # idle live connections are already kept open by the shared KeepaliveScheduler
+        self.client = DeepgramClient(settings.DEEPGRAM_API_KEY)
+
+    async def start_live(self, on_transcript, on_utterance_end, endpointing_ms, utterance_end_ms):
+        from deepgram import LiveOptions, LiveTranscriptionEvents
+
+        connection = self.client.listen.live.v("1")
+
+        # SDK callbacks run on Deepgram's thread
+        def on_result(self_dg, result, **kwargs):
+            on_transcript(result)
+
+        def on_end(self_dg, utterance_end, **kwargs):
+            on_utterance_end()
+
+        connection.on(LiveTranscriptionEvents.Transcript, on_result)
+        connection.on(LiveTranscriptionEvents.UtteranceEnd, on_end)
+
+        options = LiveOptions(
+            model="nova-2",
+            language="en-US",
+            interim_results=True,
+            smart_format=True,
+            filler_words=True,  # keep "um"/"uh" for the speech features
+            endpointing=str(endpointing_ms),
+            utterance_end_ms=str(utterance_end_ms),
+        )
+
+        start = asyncio.ensure_future(asyncio.to_thread(connection.start, options))
+        try:
+            started = await asyncio.shield(start)
+        except asyncio.CancelledError:
+            # A sibling setup stage failed: let the start finish in its thread, then close it again
+            start.add_done_callback(
+                lambda _: asyncio.ensure_future(asyncio.to_thread(connection.finish))
+            )
+            raise
+        if not started: raise Exception("Deepgram rejected connection")
+        return connection
+
+    def tts_chunks(self, text, chunk_bytes):
+        from deepgram.clients.speak.v1 import SpeakOptions
+
+        options = SpeakOptions(model=TTS_VOICE, encoding=TTS_ENCODING)
+        response = self.client.speak.rest.v("1").stream_raw({"text": text}, options)
+        try:
+            for chunk in response.iter_bytes(chunk_bytes):
+                if chunk:
+                    yield chunk
+        finally:
+            response.close()
+
+
+class FakeSpeechProvider(SpeechProvider):
+    """
+    Deterministic in-process backend. TTS sleeps for a first-byte latency,
+    then yields pseudo-audio sized by text length at a fixed chunk interval.
+    STT plays the scripted answers against the audio clock (bytes received /
+    FAKE_STT_BYTES_PER_SECOND), so results depend only on what was sent.
+    Latency jitter comes from seeded RNGs: same inputs, same timings.
+    """
+    name = "fake"
+
+    def __init__(self):
+        self.answers = [a.split() for a in settings.FAKE_STT_TRANSCRIPTS if a.strip()] or [["Yes."]]
+        self.jitter = settings.FAKE_SPEECH_JITTER
+
+    async def start_live(self, on_transcript, on_utterance_end, endpointing_ms, utterance_end_ms):
+        await asyncio.sleep(settings.FAKE_STT_CONNECT_LATENCY)
+        return FakeLiveTranscription(
+            self, asyncio.get_running_loop(), on_transcript, on_utterance_end, utterance_end_ms / 1000
+        )
+
+    def tts_chunks(self, text, chunk_bytes):
+        rng = random.Random(text)
+        time.sleep(self._jittered(rng, settings.FAKE_TTS_FIRST_BYTE))
+        size = max(1, len(text) * settings.FAKE_TTS_BYTES_PER_CHAR)
+        pattern = hashlib.sha256(text.encode()).digest()
+        audio = (pattern * (size // len(pattern) + 1))[:size]
+        for start in range(0, size, chunk_bytes):
+            if start:
+                time.sleep(self._jittered(rng, settings.FAKE_TTS_CHUNK_INTERVAL))
+            yield audio[start:start + chunk_bytes]
+
+    def _jittered(self, rng: random.Random, seconds: float) -> float:
+        return max(0.0, seconds * (1 + rng.uniform(-self.jitter, self.jitter)))
+
+
+class FakeLiveTranscription:
+    """
+    Scripted live stream. Answer n starts FAKE_STT_ANSWER_GAP seconds (audio
+    clock) after the previous one ended and is spoken at FAKE_STT_WPM: interim
+    results as words are reached, a final every FAKE_STT_SEGMENT_WORDS words
+    (speech_final on the last), then UtteranceEnd after utterance_end seconds.
+    """
+
+    def __init__(self, provider: FakeSpeechProvider, loop, on_transcript, on_utterance_end, utterance_end: float):
+        self.provider = provider
+        self.loop = loop
+        self.on_transcript = on_transcript
+        self.on_utterance_end = on_utterance_end
+        self.utterance_end = utterance_end
+        self.rng = random.Random(0)
+        self.lock = threading.Lock()
+        self.closed = False
+        self.last_due = 0.0
+
+        self.clock = 0.0  # seconds of audio received
+        self.word_seconds = 60 / max(1, settings.FAKE_STT_WPM)
+        self.answer = -1
+        self._next_answer(settings.FAKE_STT_ANSWER_GAP)
+
+    def send(self, data) -> bool:
+        if isinstance(data, str) or self.closed:
+            return True  # KeepAlive and other control messages
+        with self.lock:
+            self.clock += len(data) / settings.FAKE_STT_BYTES_PER_SECOND
+            self._advance()
+        return True
+
+    def finish(self):
+        self.closed = True
+
+    def _next_answer(self, gap: float):
+        self.answer += 1
+        self.words: List[str] = self.provider.answers[self.answer % len(self.provider.answers)]
+        self.start = (self.end_of_speech if self.answer else 0.0) + gap
+        self.end_of_speech = self.start + len(self.words) * self.word_seconds
+        self.finalized = 0
+        self.interim = 0
+
+    def _advance(self):
+        segment_words = max(1, settings.FAKE_STT_SEGMENT_WORDS)
+        spoken = min(len(self.words), max(0, int((self.clock - self.start) / self.word_seconds)))
+
+        while spoken - self.finalized >= segment_words or (spoken == len(self.words) and self.finalized < spoken):
+            count = min(segment_words, spoken - self.finalized)
+            last = self.finalized + count == len(self.words)
+            self._emit(self.on_transcript, self._result(self.finalized, count, True, last))
+            self.finalized += count
+            self.interim = self.finalized
+
+        if spoken > self.interim:
+            self._emit(self.on_transcript, self._result(self.finalized, spoken - self.finalized, False, False))
+            self.interim = spoken
+
+        if self.finalized == len(self.words) and self.clock >= self.end_of_speech + self.utterance_end:
+            self._emit(self.on_utterance_end)
+            self._next_answer(settings.FAKE_STT_ANSWER_GAP)
+
+    def _result(self, first: int, count: int, is_final: bool, speech_final: bool):
+        words = []
+        for index in range(first, first + count):
+            start = self.start + index * self.word_seconds
+            word = self.words[index]
+            words.append(SimpleNamespace(
+                word=word.strip(".,!?;:").lower(),
+                punctuated_word=word,
+                start=round(start, 3),
+                end=round(start + self.word_seconds * 0.8, 3),
+                confidence=round(self.rng.uniform(0.9, 0.99), 3),
+            ))
+        start = words[0].start
+        alternative = SimpleNamespace(
+            transcript=" ".join(w.punctuated_word for w in words),
+            confidence=round(sum(w.confidence for w in words) / len(words), 3),
+            words=words,
+        )
+        return SimpleNamespace(
+            channel=SimpleNamespace(alternatives=[alternative]),
+            is_final=is_final,
+            speech_final=speech_final,
+            start=start,
+            duration=round(words[-1].end - start, 3),
+        )
+
+    def _emit(self, callback, *args):
+        delay = settings.FAKE_STT_LATENCY * (1 + self.rng.uniform(-self.provider.jitter, self.provider.jitter))
+        # Jitter never reorders events: each is due strictly after the previous one
+        due = max(self.loop.time() + max(0.0, delay), self.last_due + 1e-6)
+        self.last_due = due
+        self.loop.call_soon_threadsafe(self.loop.call_at, due, callback, *args)
+
+
+PROVIDERS = {
+    DeepgramProvider.name: DeepgramProvider,
+    FakeSpeechProvider.name: FakeSpeechProvider,
+}
+
+_provider: Optional[SpeechProvider] = None
+
+
+def get_speech_provider() -> SpeechProvider:
+    """The configured speech backend, shared by every interview in this process."""
+    global _provider
+    if _provider is None:
+        _provider = PROVIDERS[settings.SPEECH_PROVIDER]()
+        logger.info(f"🗣️ Speech provider: {_provider.name}")
+    return _provider
@@ -1,3 +1,689 @@
-from django.test import TestCase
+import asyncio
+import time
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from . import llm, outbox
+from .audio_frames import FRAME_HEADER, KIND_AUDIO, KIND_END, AudioFrame, decode_frame, encode_frame
+from .audio_relay import AudioRelay
+from .centrifugo_client import PublishBatcher
+from .interview_state import InterviewState
+from .json_stream import JSONFieldExtractor
+from .keepalive import KEEPALIVE_MESSAGE, KeepaliveScheduler
+from .schemas import response_config
+from .speech_features import SpeechFeatures, extract_features
+from .speculation import Speculator
+from .speech_providers import FakeSpeechProvider
+from .transcript import Transcript, TranscriptSegment
+from .tts import SentenceTTSPipeline, split_sentences
+from .turn_detection import TurnDetector
+from .turns import SPEAKING, THINKING, TurnScheduler
+
+
+class SplitSentencesTests(SimpleTestCase):
+
+    def test_splits_on_sentence_punctuation(self):
+        self.assertEqual(
+            split_sentences("Thanks for that. Why a queue? Tell me more!"),
+            ["Thanks for that.", "Why a queue?", "Tell me more!"],
+        )
+
+    def test_short_fragments_merge_into_the_next_sentence(self):
+        self.assertEqual(
+            split_sentences("Great. Ok. How would you shard the users table?", min_chars=12),
+            ["Great. Ok. How would you shard the users table?"],
+        )
+
+    def test_short_trailing_fragment_merges_into_the_previous_sentence(self):
+        self.assertEqual(
+            split_sentences("How would you shard the users table? Go.", min_chars=12),
+            ["How would you shard the users table? Go."],
+        )
+
+    def test_empty_reply(self):
+        self.assertEqual(split_sentences("   "), [])
+
+
+class StubTTSProvider:
+    """Yields each sentence back as two chunks; `delays` maps a sentence to its first-byte latency."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+
+    def tts_chunks(self, text, chunk_bytes):
+        time.sleep(self.delays.get(text, 0))
+        yield f"{text}|1".encode()
+        yield f"{text}|2".encode()
+
+
+class SentenceTTSPipelineTests(SimpleTestCase):
+
+    async def test_audio_comes_back_in_sentence_order(self):
+        # The first sentence renders slowest; its audio must still play first
+        provider = StubTTSProvider({"One.": 0.05, "Two.": 0.01})
+        pipeline = SentenceTTSPipeline(provider, asyncio.get_running_loop(), max_concurrency=3)
+        chunks = [chunk async for chunk in pipeline.stream("One. Two. Three.")]
+        self.assertEqual(chunks, [
+            b"One.|1", b"One.|2", b"Two.|1", b"Two.|2", b"Three.|1", b"Three.|2",
+        ])
+
+    async def test_unsplit_reply_is_rendered_whole(self):
+        pipeline = SentenceTTSPipeline(StubTTSProvider(), asyncio.get_running_loop())
+        chunks = [chunk async for chunk in pipeline.stream("One. Two.", split=False)]
+        self.assertEqual(chunks, [b"One. Two.|1", b"One. Two.|2"])
+
+
+class JSONFieldExtractorTests(SimpleTestCase):
+
+    def test_fields_complete_as_soon_as_they_close(self):
+        extractor = JSONFieldExtractor()
+        text = '{"score": 7, "next_question": "Why {not}, \\"really\\"?", "tags": [1, [2]], "done": true}'
+        seen = []
+        for ch in text:
+            seen.extend(extractor.feed(ch))
+
+        self.assertEqual(seen, ["score", "next_question", "tags", "done"])
+        self.assertEqual(extractor.values, {
+            "score": 7, "next_question": 'Why {not}, "really"?', "tags": [1, [2]], "done": True,
+        })
+
+    def test_field_is_available_before_the_object_ends(self):
+        extractor = JSONFieldExtractor()
+        extractor.feed('{"next_question": "Next?", "critique": "still gene')
+        self.assertEqual(extractor.values, {"next_question": "Next?"})
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def test_opens_after_consecutive_failures_and_half_opens_after_cooldown(self):
+        breaker = llm.CircuitBreaker("model", failure_threshold=2, cooldown=0.05)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        self.assertGreater(breaker.retry_in(), 0)
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())  # half-open: one probe
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+    def test_success_closes_and_resets_the_count(self):
+        breaker = llm.CircuitBreaker("model", failure_threshold=2, cooldown=10)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.retry_in(), 0.0)
+
+
+@override_settings(
+    LLM_MAX_RETRIES=0, LLM_RETRY_BASE_DELAY=0.001, LLM_BREAKER_FAILURES=5, LLM_BREAKER_COOLDOWN=10,
+)
+class HedgedTests(SimpleTestCase):
+
+    def setUp(self):
+        llm._breakers.clear()
+
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        cancelled = []
+
+        async def fn(model):
+            if model == "primary":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(model)
+                    raise
+            return model
+
+        result = await llm.hedged(fn, ["primary", "secondary"], hedge_delay=0.01, budget=1)
+        self.assertEqual(result, "secondary")
+        self.assertEqual(cancelled, ["primary"])
+
+    async def test_failed_primary_falls_through_to_the_next_model(self):
+        async def fn(model):
+            if model == "primary":
+                raise ValueError("bad json")
+            return model
+
+        self.assertEqual(await llm.hedged(fn, ["primary", "secondary"], hedge_delay=5, budget=1), "secondary")
+
+    async def test_result_that_loses_a_tie_is_discarded(self):
+        gate = asyncio.Event()
+        discarded = []
+
+        async def fn(model):
+            await gate.wait()
+            return model
+
+        asyncio.get_running_loop().call_later(0.01, gate.set)
+        result = await llm.hedged(fn, ["primary", "secondary"], hedge_delay=0, budget=1, discard=discarded.append)
+        self.assertIn(result, ("primary", "secondary"))
+        self.assertEqual(discarded, [{"primary": "secondary", "secondary": "primary"}[result]])
+
+    async def test_budget_cancels_every_attempt(self):
+        cancelled = []
+
+        async def fn(model):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(model)
+                raise
+
+        with self.assertLogs("interviews.llm", "ERROR") as logs:
+            with self.assertRaises(TimeoutError):
+                await llm.hedged(fn, ["primary", "secondary"], hedge_delay=0.01, budget=0.05)
+        self.assertEqual(sorted(cancelled), ["primary", "secondary"])
+        self.assertIn("primary, secondary", logs.output[0])
+
+    async def test_open_circuit_skips_the_model(self):
+        for _ in range(5):
+            llm.get_breaker("primary").record_failure()
+
+        async def fn(model):
+            return model
+
+        self.assertEqual(await llm.hedged(fn, ["primary", "secondary"], hedge_delay=5, budget=1), "secondary")
+        with self.assertRaises(llm.CircuitOpenError):
+            await llm.hedged(fn, ["primary"], hedge_delay=5, budget=1)
+
+
+class InterviewStateTests(SimpleTestCase):
+
+    def test_coverage_and_averages_from_recorded_answers(self):
+        state = InterviewState(["Python", "SQL"])
+        state.record("Q1", "A1", 8, 6, "python")
+        state.record("Q2", "A2", 4, 2, "Go")
+
+        rendered = state.render(drill_depth=1)
+        self.assertIn("Skill coverage (questions/best score): Python=1q/best 8 | SQL=0q", rendered)
+        self.assertIn("avg understanding 6.0, avg explainability 4.0, last 4/2, turns 2", rendered)
+        self.assertIn("- [general · 4/10] Q: Q2 A: A2", rendered)
+
+    def test_oldest_digests_are_dropped_to_fit_the_budget(self):
+        state = InterviewState(["Python"], max_digests=3)
+        for n in range(3):
+            state.record(f"Question {n}", "word " * 20, 5, 5, "python")
+        full = state.render(0)
+        trimmed = state.render_within_budget(0, fixed_tokens=0, budget=len(full) // 4 - 10)
+        self.assertNotIn("Question 0", trimmed)
+        self.assertIn("Question 2", trimmed)
+
+
+class ResponseConfigTests(SimpleTestCase):
+
+    def test_configs_are_built_once_per_schema_and_temperature(self):
+        self.assertIs(response_config("decision", 0.7), response_config("decision", 0.7))
+        self.assertIsNot(response_config("decision", 0.7), response_config("decision", 0.2))
+        self.assertEqual(response_config("decision", 0.2).temperature, 0.2)
+
+
+class AudioRelayTests(SimpleTestCase):
+
+    async def test_small_frames_are_coalesced_in_order(self):
+        packets = []
+        relay = AudioRelay(packets.append, max_frames=50, packet_bytes=4, max_delay=0.05).start()
+        for frame in (b"a", b"b", b"c", b"d", b"e", b"f"):
+            await relay.push(frame)
+        await relay.close()
+
+        self.assertEqual(b"".join(packets), b"abcdef")
+        self.assertLess(len(packets), 6)
+        self.assertEqual(relay.frames_in, 6)
+        self.assertEqual(relay.dropped_frames, 0)
+
+    async def test_drop_oldest_keeps_the_newest_frames(self):
+        packets = []
+        relay = AudioRelay(packets.append, max_frames=2, packet_bytes=100, drop_policy="drop_oldest")
+        for frame in (b"1", b"2", b"3", b"4"):
+            await relay.push(frame)
+        relay.start()
+        await relay.close()
+
+        self.assertEqual(b"".join(packets), b"34")
+        self.assertEqual(relay.dropped_frames, 2)
+
+
+@override_settings(KEEPALIVE_IDLE=0.02, KEEPALIVE_TICK=0.01)
+class KeepaliveSchedulerTests(SimpleTestCase):
+
+    async def test_only_idle_connections_are_pinged(self):
+        scheduler = KeepaliveScheduler()
+        idle, busy = [], []
+        scheduler.register("idle", idle.append, lambda: 0.0)
+        scheduler.register("busy", busy.append, time.monotonic)
+        await asyncio.sleep(0.08)
+        scheduler.unregister("idle")
+        scheduler.unregister("busy")
+        await scheduler.worker
+
+        self.assertGreaterEqual(len(idle), 1)
+        self.assertEqual(set(idle), {KEEPALIVE_MESSAGE})
+        self.assertEqual(busy, [])
+
+    async def test_failed_ping_untracks_the_connection(self):
+        scheduler = KeepaliveScheduler()
+
+        def send(message):
+            raise ConnectionError("socket closed")
+
+        scheduler.register("gone", send, lambda: 0.0)
+        await asyncio.wait_for(scheduler.worker, 1)
+        self.assertEqual(scheduler.connections, {})
+
+
+class TurnDetectorTests(SimpleTestCase):
+
+    def detector(self, **kwargs):
+        self.ended = []
+        return TurnDetector(self.ended.append, **kwargs)
+
+    async def test_speech_final_ends_the_turn_after_the_grace(self):
+        detector = self.detector(silence_grace=0.01, min_words=3)
+        detector.on_final("I would use a cache", speech_final=True)
+        self.assertEqual(self.ended, [])
+        await asyncio.sleep(0.03)
+        self.assertEqual(self.ended, ["speech_final"])
+
+    async def test_new_speech_cancels_the_grace(self):
+        detector = self.detector(silence_grace=0.01, min_words=1)
+        detector.on_final("I would use", speech_final=True)
+        detector.on_interim("a cache")
+        await asyncio.sleep(0.03)
+        self.assertEqual(self.ended, [])
+
+    async def test_short_answer_waits_for_utterance_end(self):
+        detector = self.detector(silence_grace=0.01, min_words=3)
+        detector.on_final("Yes.", speech_final=True)
+        await asyncio.sleep(0.03)
+        self.assertEqual(self.ended, [])
+
+        detector.on_utterance_end()
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.ended, ["utterance_end"])
+
+    async def test_utterance_end_without_speech_is_ignored(self):
+        detector = self.detector()
+        detector.on_utterance_end()
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.ended, [])
+
+
+class FakeEvaluation:
+
+    def __init__(self, text):
+        self.text = text
+        self.discarded = False
+
+    def discard(self):
+        self.discarded = True
+
+
+class FakeBrain:
+    """evaluate() finishes after `delay` seconds; every call is recorded."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.evaluations = []
+
+    def can_speculate(self):
+        return True
+
+    def speech_features(self, transcript, pause_duration):
+        return None
+
+    async def evaluate(self, text, pause_duration, speech):
+        await asyncio.sleep(self.delay)
+        evaluation = FakeEvaluation(text)
+        self.evaluations.append(evaluation)
+        return evaluation
+
+
+class SpeculatorTests(SimpleTestCase):
+
+    async def test_turn_ending_on_the_same_text_takes_the_speculation(self):
+        speculator = Speculator(FakeBrain(), stable_after=0.01)
+        speculator.on_final(SimpleNamespace(text="I would add an index."), 1.0)
+        await asyncio.sleep(0.03)
+
+        task = speculator.take("I  would add an index.")
+        self.assertIsNotNone(task)
+        self.assertEqual((await task).text, "I would add an index.")
+
+    async def test_turn_ending_on_different_text_is_a_miss(self):
+        brain = FakeBrain(delay=10)
+        speculator = Speculator(brain, stable_after=0.01)
+        speculator.on_final(SimpleNamespace(text="I would add an index."), 1.0)
+        await asyncio.sleep(0.03)
+        running = speculator.task
+
+        self.assertIsNone(speculator.take("I would add an index on user_id."))
+        await asyncio.sleep(0)
+        self.assertTrue(running.cancelled())
+
+    async def test_no_speculation_until_the_transcript_is_stable(self):
+        brain = FakeBrain()
+        speculator = Speculator(brain, stable_after=0.02)
+        speculator.on_final(SimpleNamespace(text="I would"), 1.0)
+        await asyncio.sleep(0.01)
+        speculator.on_speech()
+        await asyncio.sleep(0.03)
+        self.assertIsNone(speculator.take("I would"))
+        self.assertEqual(brain.evaluations, [])
+
+    async def test_finished_but_superseded_evaluation_is_discarded(self):
+        brain = FakeBrain()
+        speculator = Speculator(brain, stable_after=0.01)
+        speculator.on_final(SimpleNamespace(text="Use a cache."), 1.0)
+        await asyncio.sleep(0.03)
+
+        speculator.on_final(SimpleNamespace(text="Use a cache. Maybe Redis."), 1.0)
+        self.assertTrue(brain.evaluations[0].discarded)
+
+
+class TurnSchedulerTests(SimpleTestCase):
+
+    async def test_turns_run_one_at_a_time_in_order(self):
+        turns = TurnScheduler("session")
+        order = []
+
+        async def turn(name):
+            order.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name} end")
+
+        turns.submit(turn, "intro")
+        last = turns.submit(turn, "reply", answer="A1")
+        await last
+        self.assertEqual(order, ["intro start", "intro end", "reply start", "reply end"])
+        self.assertEqual(turns.phase, "idle")
+
+    async def test_queued_reply_does_not_hide_the_running_turn(self):
+        turns = TurnScheduler("session")
+        speaking = asyncio.Event()
+
+        async def reply():
+            turns.speaking()
+            speaking.set()
+            await asyncio.sleep(10)
+
+        turns.submit(reply, answer="A1")
+        await speaking.wait()
+        turns.submit(reply, answer="A2")
+
+        self.assertEqual(turns.phase, SPEAKING)
+        self.assertEqual(turns.answer, "A1")
+        self.assertTrue(turns.interruptible())
+        # A1 was heard; only the queued reply's answer comes back
+        self.assertEqual(turns.interrupt(), (SPEAKING, ["A2"]))
+
+    async def test_intro_setup_is_not_interruptible_behind_a_queued_reply(self):
+        turns = TurnScheduler("session")
+        started = asyncio.Event()
+
+        async def intro():
+            started.set()
+            await asyncio.sleep(10)
+
+        turns.submit(intro)
+        await started.wait()
+        turns.submit(intro, answer="A1")
+
+        self.assertEqual(turns.phase, THINKING)
+        self.assertFalse(turns.interruptible())
+        turns.interrupt()
+
+    async def test_interrupt_while_thinking_returns_the_unanswered_answer(self):
+        turns = TurnScheduler("session")
+        started = asyncio.Event()
+
+        async def reply():
+            started.set()
+            await asyncio.sleep(10)
+
+        task = turns.submit(reply, answer="A1")
+        await started.wait()
+
+        self.assertEqual(turns.interrupt(), (THINKING, ["A1"]))
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertIsNone(turns.interrupt())
+
+
+def segment(words, start=0.0, step=0.4, confidence=0.95):
+    """One final result with words `step` seconds apart, each spoken for 0.3s."""
+    starts = [start + i * step for i in range(len(words))]
+    return TranscriptSegment(
+        " ".join(words), start, starts[-1] + 0.3, confidence, list(words),
+        starts, [s + 0.3 for s in starts], [confidence] * len(words),
+    )
+
+
+class ExtractFeaturesTests(SimpleTestCase):
+
+    def test_no_word_timings_gives_no_features(self):
+        empty = TranscriptSegment("hello", 0, 1, 0.9, [], [], [], [])
+        self.assertIsNone(extract_features(Transcript([empty]), latency=1.0))
+
+    def test_rate_pauses_and_fillers(self):
+        words = ["Um,", "I", "would", "add", "an", "index", "there", "first"]
+        features = extract_features(Transcript([segment(words)]), latency=1.5)
+
+        self.assertEqual(features.words, 8)
+        self.assertAlmostEqual(features.duration, 3.1, places=2)
+        self.assertAlmostEqual(features.wpm, 8 / 3.1 * 60, places=0)
+        self.assertAlmostEqual(features.pause_mean, 0.1, places=2)
+        self.assertEqual(features.long_pauses, 0)
+        self.assertEqual(features.filler_rate, 12.5)
+        self.assertIsNone(features.fluency_shift)
+        self.assertEqual(features.flags, [])
+
+    def test_delayed_fluent_start_is_flagged(self):
+        words = ["An", "index", "on", "the", "foreign", "key", "avoids", "scans"]
+        features = extract_features(Transcript([segment(words)]), latency=9.0, latency_flag=8.0)
+        self.assertIn("delayed_fluent_start", features.flags)
+
+    def test_fluency_spike_against_earlier_answers(self):
+        history = [SpeechFeatures(wpm=100.0), SpeechFeatures(wpm=110.0)]
+        fast = segment(["word"] * 20, step=0.2)
+        features = extract_features(Transcript([fast]), latency=1.0, history=history, spike_flag=2.0)
+        self.assertGreater(features.fluency_shift, 2.0)
+        self.assertIn("fluency_spike", features.flags)
+
+
+class AudioFrameTests(SimpleTestCase):
+
+    def test_audio_frame_round_trip(self):
+        frame = encode_frame(KIND_AUDIO, "mp3", 7, 42, b"\xff\xfb audio")
+        self.assertEqual(len(frame), FRAME_HEADER.size + 8)
+        self.assertEqual(decode_frame(frame), AudioFrame(KIND_AUDIO, "mp3", 7, 42, b"\xff\xfb audio"))
+
+    def test_end_frame_has_header_only(self):
+        frame = encode_frame(KIND_END, "pcm16", 3, 12)
+        self.assertEqual(frame, bytes([1, KIND_END, 2, 0, 0, 0, 0, 3, 0, 0, 0, 12]))
+        self.assertEqual(decode_frame(frame), AudioFrame(KIND_END, "pcm16", 3, 12, b""))
+
+    def test_counters_wrap_to_32_bits(self):
+        frame = decode_frame(encode_frame(KIND_AUDIO, "mp3", 2 ** 32 + 1, 2 ** 32, b""))
+        self.assertEqual((frame.utterance, frame.sequence), (1, 0))
+
+    def test_unknown_version_is_rejected(self):
+        with self.assertRaises(ValueError):
+            decode_frame(b"\x02" + encode_frame(KIND_AUDIO, "mp3", 1, 1)[1:])
+
+
+class FakeBatchAPI:
+    """Stands in for CentrifugoPublisher._post; `replies` builds the reply list for each batch."""
+
+    def __init__(self, replies=None):
+        self.batches = []
+        self.replies = replies
+
+    async def _post(self, url, payload, method):
+        await asyncio.sleep(0.005)
+        commands = [c["publish"] for c in payload["commands"]]
+        self.batches.append(commands)
+        if self.replies is not None:
+            return self.replies(commands)
+        return {"replies": [{"publish": {"offset": n}} for n in range(len(commands))]}
+
+
+class PublishBatcherTests(SimpleTestCase):
+
+    async def test_publications_are_coalesced_and_keep_per_channel_order(self):
+        api = FakeBatchAPI()
+        batcher = PublishBatcher(api, window=0.01, max_size=4, lanes=2)
+        await asyncio.gather(*(
+            batcher.submit(channel, {"n": n}) for n in range(6) for channel in ("a", "b")
+        ))
+
+        self.assertLess(len(api.batches), 12)
+        self.assertTrue(all(len(batch) <= 4 for batch in api.batches))
+        for channel in ("a", "b"):
+            sent = [c["data"]["n"] for batch in api.batches for c in batch if c["channel"] == channel]
+            self.assertEqual(sent, list(range(6)))
+
+    async def test_each_caller_gets_its_own_reply(self):
+        def replies(commands):
+            return {"replies": [
+                {"error": {"code": 102}} if c["data"]["n"] == 1 else {"publish": {"offset": c["data"]["n"]}}
+                for c in commands
+            ]}
+
+        batcher = PublishBatcher(FakeBatchAPI(replies), window=0.01)
+        results = await asyncio.gather(*(batcher.submit("a", {"n": n}) for n in range(3)))
+        self.assertEqual(results, [{"offset": 0}, {"error": {"code": 102}}, {"offset": 2}])
+
+    async def test_failed_batch_fails_every_caller(self):
+        batcher = PublishBatcher(FakeBatchAPI(lambda commands: {"error": "timeout"}), window=0.01)
+        results = await asyncio.gather(*(batcher.submit("a", {"n": n}) for n in range(2)))
+        self.assertEqual(results, [{"error": "timeout"}, {"error": "timeout"}])
+
+
+class FakePublisher:
+    """Records successful publications; `failures` maps a payload's tag to how often it fails first."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.sent = []
+
+    async def publish(self, channel, data):
+        await asyncio.sleep(0)
+        tag = data.get("event") or data.get("sequence", data["type"])
+        if self.failures.get(tag, 0) > 0:
+            self.failures[tag] -= 1
+            return {"error": "unavailable"}
+        self.sent.append(tag)
+        return {}
+
+
+@override_settings(
+    CENTRIFUGO_BATCHING=True, OUTBOX_BATCH=50, OUTBOX_MAX_EVENTS=100, OUTBOX_SHED_DEPTH=50,
+    OUTBOX_MAX_RETRIES=2, OUTBOX_RETRY_BASE=0.001, OUTBOX_RETRY_MAX=0.005,
+    CENTRIFUGO_BREAKER_FAILURES=100, CENTRIFUGO_BREAKER_COOLDOWN=0.01,
+)
+class PublishOutboxTests(SimpleTestCase):
+
+    def setUp(self):
+        outbox._breaker = None
+
+    async def drained(self, box):
+        while box.task is not None and not box.task.done():
+            await box.task
+
+    async def test_delivers_in_enqueue_order(self):
+        publisher = FakePublisher()
+        box = outbox.PublishOutbox(publisher, "session")
+        box.event("speech_start", {"utterance": 1})
+        for sequence in range(3):
+            box.audio_chunk(b"mp3", sequence, "mp3")
+        box.audio_end(3, "mp3")
+        await self.drained(box)
+        self.assertEqual(publisher.sent, ["speech_start", 0, 1, 2, "tts_audio_end"])
+
+    async def test_failed_publication_is_retried_without_reordering(self):
+        publisher = FakePublisher(failures={1: 1})
+        box = outbox.PublishOutbox(publisher, "session")
+        for sequence in range(4):
+            box.audio_chunk(b"mp3", sequence, "mp3")
+        await self.drained(box)
+        # 2 and 3 went out in the failed round too; they are re-sent after 1 (at-least-once)
+        self.assertEqual(publisher.sent, [0, 2, 3, 1, 2, 3])
+        self.assertEqual(publisher.sent[publisher.sent.index(1):], [1, 2, 3])
+
+    @override_settings(CENTRIFUGO_BATCHING=False)
+    async def test_publication_is_dropped_after_max_retries(self):
+        publisher = FakePublisher(failures={"text_message": 10})
+        box = outbox.PublishOutbox(publisher, "session")
+        box.text_message("Hello")
+        box.event("speech_end")
+        await self.drained(box)
+        self.assertEqual(publisher.sent, ["speech_end"])
+
+    @override_settings(OUTBOX_SHED_DEPTH=2)
+    async def test_backlog_sheds_only_non_critical_events(self):
+        publisher = FakePublisher()
+        box = outbox.PublishOutbox(publisher, "session")
+        box.text_message("Hello")
+        box.audio_chunk(b"mp3", 0, "mp3")
+        box.event("speech_end")
+        box.event("speech_interrupted", {"utterance": 1})
+        await self.drained(box)
+        self.assertEqual(publisher.sent, ["text_message", 0, "speech_interrupted"])
+
+    async def test_drop_utterance_discards_queued_reply_audio(self):
+        publisher = FakePublisher()
+        box = outbox.PublishOutbox(publisher, "session")
+        box.event("speech_start", {"utterance": 1})
+        for sequence in range(3):
+            box.audio_chunk(b"mp3", sequence, "mp3", utterance=1)
+        box.drop_utterance(1)
+        box.event("speech_interrupted", {"utterance": 1})
+        await self.drained(box)
+        self.assertEqual(publisher.sent, ["speech_start", "speech_interrupted"])
+
+
+@override_settings(
+    FAKE_STT_TRANSCRIPTS=["I would use a queue here."], FAKE_STT_CONNECT_LATENCY=0, FAKE_STT_LATENCY=0.001,
+    FAKE_STT_WPM=600, FAKE_STT_BYTES_PER_SECOND=1000, FAKE_STT_SEGMENT_WORDS=3, FAKE_STT_ANSWER_GAP=0.2,
+    FAKE_TTS_FIRST_BYTE=0, FAKE_TTS_CHUNK_INTERVAL=0, FAKE_TTS_BYTES_PER_CHAR=10, FAKE_SPEECH_JITTER=0.2,
+)
+class FakeSpeechProviderTests(SimpleTestCase):
+
+    def test_tts_is_deterministic_and_sized_by_text(self):
+        provider = FakeSpeechProvider()
+        first = list(provider.tts_chunks("Tell me about queues.", 64))
+        second = list(provider.tts_chunks("Tell me about queues.", 64))
+
+        self.assertEqual(first, second)
+        self.assertEqual(sum(map(len, first)), len("Tell me about queues.") * 10)
+        self.assertTrue(all(len(chunk) <= 64 for chunk in first))
+        self.assertNotEqual(b"".join(first), b"".join(provider.tts_chunks("Tell me about caches.", 64)))
+
+    async def run_answer(self):
+        events = []
+
+        def on_transcript(result):
+            alternative = result.channel.alternatives[0]
+            events.append((alternative.transcript, result.is_final, result.speech_final,
+                           [w.start for w in alternative.words]))
+
+        live = await FakeSpeechProvider().start_live(
+            on_transcript, lambda: events.append("utterance_end"), endpointing_ms=300, utterance_end_ms=100
+        )
+        for _ in range(10):
+            live.send(b"\0" * 100)  # 0.1s of audio each
+        live.finish()
+        await asyncio.sleep(0.05)
+        return events
+
+    async def test_scripted_answer_plays_against_the_audio_clock(self):
+        events = await self.run_answer()
+        finals = [e[:3] for e in events if e != "utterance_end" and e[1]]
+
+        self.assertEqual(finals, [("I would use", True, False), ("a queue here.", True, True)])
+        self.assertEqual(events[-1], "utterance_end")
+        self.assertEqual(events, await self.run_answer())
@@ -0,0 +1,100 @@
+"""
+Structured Candidate Transcripts
+Keeps each finalized Deepgram result as a compact segment (text, timing,
+confidence, per-word timings) instead of concatenating strings, so answers
+carry exact speech timing for scoring, replay and persistence.
+"""
+
+
+from array import array
+from typing import List, Optional
+
+
+class TranscriptSegment:
+    """One finalized Deepgram result. Times are seconds on the live stream's audio clock."""
+    __slots__ = ("text", "start", "end", "confidence", "words", "word_starts", "word_ends", "word_confidences")
+
+    def __init__(self, text: str, start: float, end: float, confidence: float,
+                 words: List[str], word_starts, word_ends, word_confidences):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.confidence = confidence
+        self.words = words
+        self.word_starts = array("f", word_starts)
+        self.word_ends = array("f", word_ends)
+        self.word_confidences = array("f", word_confidences)
+
+    @classmethod
+    def from_result(cls, result) -> "TranscriptSegment":
+        """Build from a Deepgram LiveResultResponse (final)."""
+        alternative = result.channel.alternatives[0]
+        words = alternative.words or []
+        start = float(result.start or 0)
+        return cls(
+            text=alternative.transcript,
+            start=start,
+            end=start + float(result.duration or 0),
+            confidence=float(alternative.confidence or 0),
+            words=[w.punctuated_word or w.word for w in words],
+            word_starts=[w.start for w in words],
+            word_ends=[w.end for w in words],
+            word_confidences=[w.confidence for w in words],
+        )
+
+    @property
+    def first_word_start(self) -> float:
+        return self.word_starts[0] if self.word_starts else self.start
+
+    def to_dict(self):
+        return {
+            "text": self.text,
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "confidence": round(self.confidence, 3),
+            # [word, start, end, confidence] rows keep the JSON small
+            "words": [
+                [word, round(start, 3), round(end, 3), round(confidence, 3)]
+                for word, start, end, confidence in zip(
+                    self.words, self.word_starts, self.word_ends, self.word_confidences
+                )
+            ],
+        }
+
+
+class Transcript:
+    """The candidate's current answer as a list of segments."""
+    __slots__ = ("segments",)
+
+    def __init__(self, segments: Optional[List[TranscriptSegment]] = None):
+        self.segments = segments or []
+
+    def append(self, segment: TranscriptSegment):
+        self.segments.append(segment)
+
+    def prepend(self, other: "Transcript"):
+        """Put an earlier part of the same answer back in front (used after a barge-in)."""
+        self.segments[:0] = other.segments
+
+    def take(self) -> "Transcript":
+        """Hand over the collected segments and start a new, empty answer."""
+        taken, self.segments = Transcript(self.segments), []
+        return taken
+
+    @property
+    def text(self) -> str:
+        return " ".join(segment.text for segment in self.segments)
+
+    @property
+    def first_word_start(self) -> Optional[float]:
+        return self.segments[0].first_word_start if self.segments else None
+
+    @property
+    def word_count(self) -> int:
+        return sum(len(segment.words) or len(segment.text.split()) for segment in self.segments)
+
+    def __bool__(self):
+        return bool(self.segments)
+
+    def to_list(self):
+        return [segment.to_dict() for segment in self.segments]
@@ -0,0 +1,108 @@
+"""
+Sentence-Pipelined TTS
+Splits interviewer replies into sentences, renders them concurrently and
+yields the audio back in reply order so playback can start on sentence one.
+"""
+
+
+import asyncio
+import logging
+import re
+import threading
+from typing import AsyncIterator, List
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+TTS_VOICE = "aura-asteria-en"
+TTS_ENCODING = "mp3"
+
+
+def split_sentences(text: str, min_chars: int = 0) -> List[str]:
+    """
+    Split a reply into sentences for independent synthesis.
+
+    Fragments shorter than min_chars (e.g. "Great.") are merged into the
+    following sentence so we don't pay a full TTS round-trip for them.
+    """
+    sentences = []
+    pending = ""
+    for part in SENTENCE_BOUNDARY.split(text.strip()):
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ""
+
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+class SentenceTTSPipeline:
+    """
+    Renders sentences through the speech provider with a bounded fan-out.
+
+    Each sentence streams into its own queue; the consumer drains the queues
+    in order, so the first sentence plays while later ones are still rendering.
+    """
+
+    def __init__(self, provider, loop, max_concurrency=3, chunk_bytes=8192, min_sentence_chars=0):
+        self.provider = provider
+        self.loop = loop
+        self.max_concurrency = max(1, max_concurrency)
+        self.chunk_bytes = chunk_bytes
+        self.min_sentence_chars = min_sentence_chars
+
+    async def stream(self, text: str, split: bool = True) -> AsyncIterator[bytes]:
+        """Yield audio chunks for the whole reply, in sentence order."""
+        sentences = split_sentences(text, self.min_sentence_chars) if split else [text]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        queues = [asyncio.Queue() for _ in sentences]
+        tasks = [
+            asyncio.create_task(self._render(sentence, queue, semaphore))
+            for sentence, queue in zip(sentences, queues)
+        ]
+
+        try:
+            for queue, task in zip(queues, tasks):
+                while (chunk := await queue.get()) is not None:
+                    yield chunk
+                await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _render(self, sentence, queue, semaphore):
+        stop = threading.Event()
+        async with semaphore:
+            try:
+                await asyncio.to_thread(self._pump, sentence, queue, stop)
+            except asyncio.CancelledError:
+                stop.set()
+                raise
+
+    def _pump(self, sentence, queue, stop):
+        """Runs in a worker thread: copies the provider's audio stream into the queue."""
+        try:
+            chunks = self.provider.tts_chunks(sentence, self.chunk_bytes)
+            try:
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    self.loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            finally:
+                chunks.close()
+        finally:
+            self.loop.call_soon_threadsafe(queue.put_nowait, None)
+
+
+async def synthesize(provider, text: str, max_concurrency: int = 3) -> bytes:
+    """Render a whole text to a single MP3 (used for pre-generated audio)."""
+    pipeline = SentenceTTSPipeline(provider, asyncio.get_running_loop(), max_concurrency=max_concurrency)
+    return b"".join([chunk async for chunk in pipeline.stream(text)])
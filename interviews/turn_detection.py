@@ -0,0 +1,79 @@
+"""
+Server-Side Turn Detection
+Decides when the candidate has finished answering from Deepgram's live
+endpointing signals (speech_final on a Transcript, UtteranceEnd), so the
+next question can start without waiting for the client's "done" click.
+"""
+
+
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TurnDetector:
+    """
+    End-of-utterance state machine. All methods run on the event loop.
+
+    speech_final arms a short grace timer (candidates pause mid-thought);
+    any further speech disarms it. UtteranceEnd already implies a long
+    silence, so it ends any non-empty turn immediately. min_words only
+    gates speech_final, so a short pause after "Well, I" doesn't end the
+    turn, while a plain "Yes." still does once UtteranceEnd arrives.
+    """
+
+    def __init__(self, on_turn: Callable[[str], object], silence_grace: float = 0.9, min_words: int = 3):
+        self.on_turn = on_turn
+        self.silence_grace = silence_grace
+        self.min_words = min_words
+        self.words = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def on_interim(self, text: str):
+        if text.strip():
+            self._disarm()
+
+    def on_final(self, text: str, speech_final: bool):
+        self.words += len(text.split())
+        if speech_final:
+            if self.words < self.min_words:
+                metrics.incr("turn_end_ignored_total", reason="too_short")
+                self._disarm()
+                return
+            self._arm(self.silence_grace, "speech_final")
+        else:
+            self._disarm()
+
+    def on_utterance_end(self):
+        self._arm(0, "utterance_end")
+
+    def restore(self, text: str):
+        """Put back an utterance whose turn was taken and then cancelled by a barge-in."""
+        self.words += len(text.split())
+
+    def reset(self):
+        """Forget the current utterance (the turn was taken some other way)."""
+        self._disarm()
+        self.words = 0
+
+    def _arm(self, delay: float, reason: str):
+        if self.words == 0:
+            return
+        self._disarm()
+        self.timer = asyncio.get_running_loop().call_later(delay, self._fire, reason)
+
+    def _disarm(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def _fire(self, reason: str):
+        self.timer = None
+        logger.info(f"🔚 End of utterance detected ({reason}, {self.words} words)")
+        metrics.incr("turns_detected_total", reason=reason)
+        self.words = 0
+        self.on_turn(reason)
@@ -0,0 +1,90 @@
+"""
+Per-Session Turn Scheduler
+Runs the interviewer's turns (intro, replies) one at a time, keeps a handle
+on each so stale LLM / TTS work can be cancelled, and tracks which phase the
+current turn is in so the consumer can decide what a barge-in interrupts.
+"""
+
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+IDLE = "idle"
+THINKING = "thinking"  # waiting on the LLM, nothing spoken yet
+SPEAKING = "speaking"  # text published, audio being synthesized / delivered
+
+
+class TurnScheduler:
+    """
+    Serializes interviewer turns for one session. All methods run on the event loop.
+
+    submit() queues a turn behind the one in flight; interrupt() cancels
+    everything queued or running and reports what was cut off.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.tasks: Dict[asyncio.Task, Any] = {}  # turn task -> candidate answer it replies to (None for the intro)
+        self.tail: Optional[asyncio.Task] = None  # last submitted turn; the next one queues behind it
+        self.current: Optional[asyncio.Task] = None  # turn that is actually running
+        self.phase = IDLE  # phase of the current turn
+
+    def submit(self, turn_fn, *args, answer: Any = None) -> asyncio.Task:
+        previous = self.tail
+        task = asyncio.create_task(self._run(previous, turn_fn, args))
+        self.tasks[task] = answer
+        task.add_done_callback(self._forget)
+        self.tail = task
+        metrics.incr("turns_submitted_total")
+        return task
+
+    def speaking(self):
+        """Called by the running turn once its reply is decided and playback starts."""
+        if self.current is asyncio.current_task():
+            self.phase = SPEAKING
+
+    @property
+    def answer(self) -> Any:
+        return self.tasks.get(self.current)
+
+    def interruptible(self) -> bool:
+        """Speech cuts off playback, or a reply still being thought about; never the intro's setup."""
+        if self.current is None or self.current.done():
+            return False
+        return self.phase == SPEAKING or (self.phase == THINKING and self.answer is not None)
+
+    def interrupt(self) -> Optional[Tuple[str, List[Any]]]:
+        """
+        Cancel every queued and running turn. Returns (phase of the current
+        turn, answers whose reply was never spoken) or None.
+        """
+        pending = [task for task in self.tasks if not task.done()]
+        if not pending:
+            return None
+        phase = self.phase
+        unspoken = [task for task in pending if not (task is self.current and phase == SPEAKING)]
+        answers = [self.tasks[task] for task in unspoken if self.tasks[task] is not None]
+        for task in pending:
+            task.cancel()
+        self.current, self.tail, self.phase = None, None, IDLE
+        metrics.incr("turns_interrupted_total", phase=phase)
+        return phase, answers
+
+    async def _run(self, previous, turn_fn, args):
+        if previous is not None and not previous.done():
+            metrics.incr("turns_queued_total")
+            await asyncio.wait([previous])
+        self.current, self.phase = asyncio.current_task(), THINKING
+        try:
+            await turn_fn(*args)
+        finally:
+            if self.current is asyncio.current_task():
+                self.current, self.phase = None, IDLE
+
+    def _forget(self, task):
+        self.tasks.pop(task, None)
@@ -12,6 +12,9 @@ urlpatterns = [
     # Results
     path('api/results/', views.InterviewResultsListView.as_view(), name='results-list'),
     
+    # Operations
+    path('api/metrics/', views.MetricsView.as_view(), name='metrics'),
+    
     # User Management
     path('api/users/', views.UserCreateView.as_view(), name='user-create'),
     
@@ -1,7 +1,11 @@
 import jwt
 import time
+import asyncio
+from asgiref.sync import async_to_sync
 from django.conf import settings
 
+_background_tasks = set()
+
 def generate_centrifugo_token(user_id, ttl=3600):
     """
     Generates a JWT token for Centrifugo v5.
@@ -11,4 +15,29 @@ def generate_centrifugo_token(user_id, ttl=3600):
         "exp": int(time.time()) + ttl,
         "iat": int(time.time())
     }
-    return jwt.encode(claims, settings.CENTRIFUGO_SECRET, algorithm="HS256")
\ No newline at end of file
+    return jwt.encode(claims, settings.CENTRIFUGO_SECRET, algorithm="HS256")
+
+
+def run_in_background(coro_fn, *args):
+    """
+    Schedule coro_fn(*args) on the server's event loop from sync view code
+    and return immediately. Relies on running under ASGI (daphne), where
+    async_to_sync hands the call back to the main loop.
+    """
+    async def spawn():
+        task = asyncio.create_task(coro_fn(*args))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async_to_sync(spawn)()
+
+
+def spawn_background(coro):
+    """
+    Fire-and-forget a coroutine from async code. The loop only keeps weak
+    references to tasks, so hold one until it finishes.
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
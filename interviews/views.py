@@ -5,10 +5,13 @@ from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from .models import JobPosting, InterviewSession, User
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, BasePermission, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from interviews.models import InterviewSession, JobPosting
 from .utils import generate_centrifugo_token
+from .metrics import metrics
+from .openers import schedule_opener_bank
+from .prewarm import schedule_prewarm
 from django.shortcuts import get_object_or_404
 from interviews.serializers import (
     JobPostingSerializer, InterviewSessionSerializer,
@@ -22,6 +25,8 @@ from weasyprint import HTML, CSS
 from django.conf import settings
 from datetime import datetime
 from django.contrib.auth import login, logout
+from django.db import transaction
+import hmac
 import os
 
 
@@ -57,7 +62,10 @@ class JobPostingListCreateView(generics.ListCreateAPIView):
         # Manually link the user by the email passed in the JSON body
         user_email = self.request.data.get('user_email')
         user = User.objects.filter(email=user_email).first()
-        serializer.save(created_by=user)
+        job = serializer.save(created_by=user)
+        
+        # Pre-generate intros, opening questions and their audio for this job
+        transaction.on_commit(lambda: schedule_opener_bank(job.id))
 
 
 # --- SESSION VIEW: NO SECURITY / EXPLICIT EMAIL LINKING ---
@@ -95,6 +103,9 @@ class JoinInterviewSessionView(APIView):
         
         token = generate_centrifugo_token(user_id=user_id)
         
+        # Build the brain and render the intro while the candidate is still in the lobby
+        schedule_prewarm(session.id)
+        
         return Response({
             "session_id": str(session.id),
             "candidate_name": session.candidate_name,
@@ -343,6 +354,27 @@ class InterviewResultsListView(APIView):
         })
 
 
+class HasMetricsToken(BasePermission):
+    """Authorization: Bearer <METRICS_TOKEN>, for scrapers without a staff session."""
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        header = request.headers.get('Authorization', '')
+        return bool(token) and hmac.compare_digest(header.encode(), f"Bearer {token}".encode())
+
+
+class MetricsView(APIView):
+    """
+    GET /api/metrics/
+    In-process counters, gauges and latency histograms for this worker.
+    Staff users only, or a scraper presenting METRICS_TOKEN.
+    """
+    permission_classes = [IsAdminUser | HasMetricsToken]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
+
+
 # ====== Authentication & User Management Views ======
 
 class UserCreateView(generics.CreateAPIView):